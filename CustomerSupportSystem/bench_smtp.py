@@ -0,0 +1,66 @@
+import os
+import time
+import smtplib
+import argparse
+
+# Compare per-message SMTP connects against the pooled sender and the
+# batched outbox, using the local stub server so no real mail is sent.
+os.environ.setdefault("EMAIL_ADDRESS", "bench@example.com")
+os.environ.setdefault("EMAIL_APP_PASSWORD", "bench-password")
+
+from tools.smtp_stub import SMTPStubServer
+from tools.gmail_sender import SMTPPool, Outbox, build_message
+
+def send_per_message(host, port, messages):
+    for msg in messages:
+        server = smtplib.SMTP(host, port)
+        server.login("bench@example.com", "bench-password")
+        server.send_message(msg)
+        server.quit()
+
+def send_pooled(pool, messages):
+    for msg in messages:
+        pool.send(msg)
+
+def send_outbox(outbox, emails):
+    futures = [outbox.submit(to, subject, body) for to, subject, body in emails]
+    for future in futures:
+        future.result()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SMTP send paths against a local stub server.")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005, help="Simulated server round-trip per reply, in seconds")
+    args = parser.parse_args()
+
+    server = SMTPStubServer(latency=args.latency).start()
+    host, port = "127.0.0.1", server.port
+    emails = [(f"customer{i}@example.com", "Regarding Your Support Ticket", f"Reply number {i}") for i in range(args.messages)]
+    messages = [build_message(*email) for email in emails]
+
+    results = {}
+
+    start = time.perf_counter()
+    send_per_message(host, port, messages)
+    results["per-message connect"] = time.perf_counter() - start
+
+    pool = SMTPPool(host, port, "bench@example.com", "bench-password", size=2, starttls=False)
+    start = time.perf_counter()
+    send_pooled(pool, messages)
+    results["pooled connection"] = time.perf_counter() - start
+
+    outbox = Outbox(SMTPPool(host, port, "bench@example.com", "bench-password", size=2, starttls=False))
+    start = time.perf_counter()
+    send_outbox(outbox, emails)
+    results["batched outbox"] = time.perf_counter() - start
+
+    print(f"{args.messages} messages, {args.latency * 1000:.1f} ms simulated latency")
+    for name, elapsed in results.items():
+        print(f"{name:<22} {elapsed:7.3f}s  {args.messages / elapsed:8.1f} msg/s")
+    print(f"stub accepted {len(server.messages)} messages over {server.connections} connections")
+
+    pool.close()
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
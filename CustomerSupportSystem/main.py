@@ -1,8 +1,6 @@
 import streamlit as st
-from tools.sheet_conector import append_processed_ticket, fetch_new_tickets,update_ticket
-from tools.classify_ticket import classify_ticket
-from tools.generate_reply import generate_reply
-from tools.gmail_sender import send_email_smtp
+from tools.sheet_conector import fetch_new_tickets, fetch_processed_tickets
+from worker import load_timings
 from dotenv import load_dotenv
 
 # ---------- Load environment variables ----------
@@ -13,63 +11,50 @@ st.set_page_config(page_title="AI Ticket Manager", layout="centered")
 
 # ---------- App Header ----------
 st.title("📨 AI Ticket Manager")
-st.caption("Analyze, classify, respond, and track customer support tickets — powered by AI & Gmail.")
-
-# ---------- Fetch New Tickets ----------
-tickets = fetch_new_tickets()
-
-if not tickets:
-    st.success("✅ No new tickets to process.")
-else:
-    for i, ticket in enumerate(tickets, start=1):
-        st.markdown(f"#### Ticket #{i}: {ticket['IssueType']} - {ticket['Email']}")
-
-        # Skip already processed tickets
-        if ticket["Sentiment"] and ticket["AutoReply"]:
-            continue
-
-        with st.expander(f"📩 Ticket #{i} from {ticket['Name']} ({ticket['Email']}"):
-            st.markdown("**📝 Message:**")
-            st.info(ticket["Message"])
-
-        if st.button(f"🔍 Analyze & Respond Ticket #{i}"):
-            with st.spinner("🤖 Running AI classification and reply generation..."):
-                classification = classify_ticket(ticket["Message"])
-                reply = generate_reply(ticket["Message"])
-
-            st.success("✅ AI Analysis Complete")
-            st.markdown(f"**Sentiment:** `{classification['sentiment']}`")
-            st.markdown(f"**Issue Type:** `{classification['issue_type']}`")
-            st.markdown("**📬 Suggested Reply:**")
-            st.text_area("Auto-Generated Reply", reply, height=140)
-
-            # Save to primary sheet
-            update_ticket(
-                row_number=i + 1,
-                sentiment=classification["sentiment"],
-                issue_type=classification["issue_type"],
-                reply=reply
-            )
-
-            # Save to 'ProcessedTickets' tab
-            append_processed_ticket(
-                ticket=ticket,
-                sentiment=classification["sentiment"],
-                issue_type=classification["issue_type"],
-                reply=reply
-            )
-
-            # Auto-send email
-            with st.spinner("📤 Sending email reply..."):
-                success = send_email_smtp(
-                    to=ticket['Email'],
-                    subject="Regarding Your Support Ticket",
-                    body=reply
-                )
-
-            if success:
-                st.success("📬 Email sent successfully!")
-            else:
-                st.error("❌ Failed to send email. Check SMTP/app password setup.")
-
-            st.info("📝 Ticket updated, logged, and customer notified.")
\ No newline at end of file
+st.caption("Track customer support tickets resolved by the background worker (`python worker.py`).")
+
+if st.button("🔄 Refresh"):
+    st.rerun()
+
+pending_tab, processed_tab, timings_tab = st.tabs(["⏳ Pending", "✅ Processed", "⏱️ Timings"])
+
+# ---------- Pending Tickets ----------
+with pending_tab:
+    tickets = fetch_new_tickets()
+
+    if not tickets:
+        st.success("✅ No new tickets to process.")
+    else:
+        st.info(f"{len(tickets)} ticket(s) waiting for the worker.")
+        for ticket in tickets:
+            with st.expander(f"📩 Row {ticket['RowNumber']}: {ticket['IssueType']} - {ticket['Name']} ({ticket['Email']})"):
+                st.markdown("**📝 Message:**")
+                st.info(ticket["Message"])
+
+# ---------- Processed Tickets ----------
+with processed_tab:
+    processed = fetch_processed_tickets()
+
+    if not processed:
+        st.info("No processed tickets yet.")
+    else:
+        for i, ticket in enumerate(reversed(processed), start=1):
+            with st.expander(f"✅ {ticket['Name']} ({ticket['Email']}) - {ticket['IssueType_Label']}"):
+                st.markdown(f"**Sentiment:** `{ticket['Sentiment']}`")
+                st.markdown(f"**Issue Type:** `{ticket['IssueType_Label']}`")
+                st.markdown("**📝 Message:**")
+                st.info(ticket["Message"])
+                st.markdown("**📬 Reply:**")
+                st.text_area("Auto-Generated Reply", ticket["AutoReply"], height=140, key=f"reply_{i}", disabled=True)
+
+# ---------- Per-stage Timings ----------
+with timings_tab:
+    timings = load_timings()
+
+    if not timings:
+        st.info("No worker timings recorded yet.")
+    else:
+        st.dataframe([
+            {"processed_at": t["processed_at"], "row": t["row_number"], "status": t["status"], **t["timings"]}
+            for t in reversed(timings)
+        ])
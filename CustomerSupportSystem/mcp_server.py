@@ -1,50 +1,155 @@
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from mcp.server.fastmcp import FastMCP
-from tools.sheet_conector import update_ticket, append_processed_ticket
-from tools.classify_ticket import classify_ticket
-from tools.generate_reply import generate_reply
+from tools.sheet_conector import append_processed_ticket, writer
+from tools.ticket_pipeline import analyze_ticket
+from tools.fast_classifier import get_fast_classifier
+from tools.reply_cache import get_reply_cache
 from tools.gmail_sender import send_email_smtp
+from tools.euri_client import get_euri_client
+from tools.idempotency_ledger import IdempotencyLedger, idempotency_key as make_idempotency_key
 
 mcp = FastMCP("AIPoweredTicketResolver")
+_ledger = None
+_ledger_lock = threading.Lock()
+
+MAX_BULK_CONCURRENCY = 8
+
+def get_ledger() -> IdempotencyLedger:
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = IdempotencyLedger()
+        return _ledger
+
+def _resolve(name: str, email: str, message: str, key: str = None) -> dict:
+    key = key or make_idempotency_key(email, message)
+    start = time.perf_counter()
+    ledger = get_ledger()
 
-@mcp.tool(name="resolve_ticket", description="Classifies, replies, updates, and emails a support ticket.")
-def resolve_ticket(name: str, email: str, message: str) -> dict:
     try:
-        # Step 1: AI Classify
-        classification = classify_ticket(message)
-        sentiment = classification["sentiment"]
-        issue_type = classification["issue_type"]
-
-        # Step 2: Generate reply
-        reply = generate_reply(message)
-
-        # Step 3: Update Google Sheet (append only)
-        fake_ticket = {
-            "Name": name,
-            "Email": email,
-            "IssueType": issue_type,
-            "Message": message
-        }
-        append_processed_ticket(fake_ticket, sentiment, issue_type, reply)
+        state, previous = ledger.claim(key)
+    except Exception as e:
+        # e.g. "database is locked" under heavy concurrency; nothing was claimed, so a retry is safe
+        return {"status": "error", "message": f"Could not claim ticket: {e}", "idempotency_key": key,
+                "seconds": round(time.perf_counter() - start, 3)}
+    if state == "done":
+        return {**previous, "status": "duplicate", "idempotency_key": key, "seconds": round(time.perf_counter() - start, 3)}
+    if state == "in_progress":
+        return {"status": "in_progress", "idempotency_key": key, "seconds": round(time.perf_counter() - start, 3)}
+    steps = previous
 
-        # Step 4: Send Email
+    try:
+        # Step 1: Classify (locally when confident) and generate reply. A retry
+        # reuses the earlier attempt's answer so the email matches the sheet row.
+        if "analysis" in steps:
+            analysis = steps["analysis"]
+            sentiment, issue_type, reply = analysis["sentiment"], analysis["issue_type"], analysis["reply"]
+            timings = {}
+        else:
+            classification, reply, timings = analyze_ticket(message, name)
+            sentiment = classification["sentiment"]
+            issue_type = classification["issue_type"]
+            ledger.record_step(key, "analysis", {"sentiment": sentiment, "issue_type": issue_type, "reply": reply})
+
+        # Step 2: Update Google Sheet (append only, once per ticket)
+        if "sheet" not in steps:
+            fake_ticket = {
+                "Name": name,
+                "Email": email,
+                "IssueType": issue_type,
+                "Message": message
+            }
+            append_processed_ticket(fake_ticket, sentiment, issue_type, reply)
+            ledger.record_step(key, "sheet")
+
+        # Step 3: Send Email
         mail_result = send_email_smtp(
                         to=email,
                         subject="Regarding Your Support Ticket",
                         body=reply
                     )
 
-        return {
+        result = {
                 "status": "success",
                 "sentiment": sentiment,
                 "issue_type": issue_type,
                 "reply": reply,
-                "mail_result": mail_result
+                "mail_result": mail_result,
+                "timings": timings
             }
+        if mail_result.get("status") == "success":
+            ledger.complete(key, result)
+        else:
+            ledger.release(key)
     except Exception as e:
-        return {
+        try:
+            ledger.release(key)
+        except Exception:
+            pass    # the claim goes stale after STALE_AFTER and can be retried then
+        result = {
                 "status": "error",
                 "message": str(e)
         }
-    
+
+    return {**result, "idempotency_key": key, "seconds": round(time.perf_counter() - start, 3)}
+
+def _ticket_error(ticket) -> str:
+    """Why a resolve_tickets entry cannot be processed, or None if it can."""
+    if not isinstance(ticket, dict):
+        return f"Expected an object with name, email and message, got {type(ticket).__name__}"
+    for field in ("name", "email", "message"):
+        if not isinstance(ticket.get(field), str) or not ticket[field].strip():
+            return f"Missing field '{field}'"
+    if ticket.get("idempotency_key") is not None and not isinstance(ticket["idempotency_key"], str):
+        return "idempotency_key must be a string"
+    return None
+
+@mcp.tool(name="resolve_ticket", description="Classifies, replies, updates, and emails a support ticket. Retries with the same ticket (or the same optional idempotency_key) are no-ops.")
+def resolve_ticket(name: str, email: str, message: str, idempotency_key: str = None) -> dict:
+    result = _resolve(name, email, message, idempotency_key)
+    writer.flush()
+    return result
+
+@mcp.tool(name="resolve_tickets", description="Resolves a list of tickets ({name, email, message, optional idempotency_key}) concurrently. Already resolved tickets are skipped.")
+def resolve_tickets(tickets: list[dict], max_concurrency: int = 4) -> dict:
+    start = time.perf_counter()
+    max_concurrency = max(1, min(max_concurrency, MAX_BULK_CONCURRENCY))
+
+    def run(ticket):
+        error = _ticket_error(ticket)
+        if error:
+            return {"status": "error", "message": error}
+        return _resolve(ticket["name"], ticket["email"], ticket["message"], ticket.get("idempotency_key"))
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = list(executor.map(run, tickets))
+    writer.flush()
+
+    counts = {}
+    for result in results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+
+    return {
+        "results": results,
+        "counts": counts,
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+@mcp.tool(name="classifier_stats", description="Reports the local ticket classifier's confidence threshold and LLM escalation rate.")
+def classifier_stats() -> dict:
+    return get_fast_classifier().report()
+
+@mcp.tool(name="reply_cache_stats", description="Reports size, hit rate and evictions of the near-duplicate reply cache.")
+def reply_cache_stats() -> dict:
+    return get_reply_cache().report()
+
+@mcp.tool(name="llm_usage_stats", description="Reports EURI calls, retries, errors, latency and token usage per call site.")
+def llm_usage_stats() -> dict:
+    return get_euri_client().report()
+
 if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
     mcp.run()
\ No newline at end of file
@@ -0,0 +1,58 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+# Measure how long each entry module takes to import in a fresh interpreter,
+# with credentials removed from the environment to prove imports stay offline.
+# With --warm-up, also time the explicit warm-up stages (needs real credentials).
+
+MODULES = [
+    "tools.sheet_conector",
+    "tools.gmail_sender",
+    "tools.classify_and_reply",
+    "tools.ticket_pipeline",
+    "worker",
+    "mcp_server",
+]
+
+IMPORT_SNIPPET = """
+import time, json
+start = time.perf_counter()
+import {module}
+print(json.dumps(time.perf_counter() - start))
+"""
+
+def time_import(module: str):
+    env = {k: v for k, v in os.environ.items() if k not in ("EMAIL_ADDRESS", "EMAIL_APP_PASSWORD", "EURI_API_KEY")}
+    env["GOOGLE_CREDS_FILE"] = os.devnull
+    proc = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET.format(module=module)],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1]
+    return json.loads(proc.stdout.strip().splitlines()[-1]), None
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CustomerSupportSystem startup cost.")
+    parser.add_argument("--warm-up", action="store_true", help="Also time tools.startup.warm_up()")
+    args = parser.parse_args()
+
+    print("Import time (fresh interpreter, no credentials):")
+    for module in MODULES:
+        seconds, error = time_import(module)
+        if error:
+            print(f"  {module:<28} failed: {error}")
+        else:
+            print(f"  {module:<28} {seconds * 1000:8.1f} ms")
+
+    if args.warm_up:
+        from tools.startup import warm_up
+        print("Warm-up:")
+        for stage, seconds in warm_up().items():
+            print(f"  {stage:<28} {seconds * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
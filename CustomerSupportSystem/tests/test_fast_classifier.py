@@ -0,0 +1,118 @@
+import math
+import random
+import pytest
+from tools import fast_classifier, sheet_conector, ticket_pipeline
+from tools.fast_classifier import FastClassifier
+
+TEMPLATES = [
+    ("Negative", "Billing", "I was charged twice on my invoice, please refund the duplicate payment"),
+    ("Neutral", "Login", "How do I reset my password, the login page says my account is locked"),
+    ("Negative", "Technical", "The app crashes with an error every time I upload a file"),
+    ("Positive", "General", "Thanks a lot, your team was great and the service is excellent"),
+]
+
+
+def history(n, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        sentiment, issue_type, text = TEMPLATES[i % len(TEMPLATES)]
+        words = text.split()
+        rng.shuffle(words)
+        records.append({"Message": " ".join(words[:8]), "Sentiment": sentiment, "IssueType_Label": issue_type})
+    return records
+
+
+def test_confidence_is_a_log_odds_margin():
+    classifier = FastClassifier(min_examples=1)
+    classifier.train(history(200))
+
+    prediction = classifier.predict("I was charged twice, please refund the duplicate payment on my invoice")
+
+    assert (prediction["sentiment"], prediction["issue_type"]) == ("Negative", "Billing")
+    # A probability would have saturated at 1.0; the margin keeps growing with evidence
+    assert prediction["confidence"] > classifier.predict("refund")["confidence"] > 0
+
+
+def test_calibration_sets_a_finite_threshold_on_separable_history():
+    classifier = FastClassifier(min_examples=1)
+
+    threshold = classifier.calibrate(history(200), precision=0.95)
+
+    assert math.isfinite(threshold)
+    assert classifier.calibration["held_out"] == 40
+    assert classifier.calibration["precision"] >= 0.95
+    assert classifier.calibration["coverage"] > 0
+
+
+def test_calibration_escalates_everything_without_enough_history():
+    classifier = FastClassifier(min_examples=1)
+
+    assert classifier.calibrate(history(40)) == math.inf
+    assert classifier.calibration["held_out"] == 8
+
+
+class StubCache:
+    def __init__(self, reply=None):
+        self.reply = reply
+        self.added = []
+
+    def lookup(self, message, name=None):
+        return self.reply
+
+    def add(self, message, reply, name=None):
+        self.added.append(reply)
+
+
+@pytest.fixture
+def llm_calls(monkeypatch):
+    calls = []
+
+    def classify_and_reply(text):
+        calls.append("classify_and_reply")
+        return {"sentiment": "Negative", "issue_type": "Billing", "reply": "Refund issued"}
+
+    def classify_ticket(text):
+        calls.append("classify_ticket")
+        return {"sentiment": "Negative", "issue_type": "Billing"}
+
+    classifier = FastClassifier(threshold=0.0, min_examples=1)
+    classifier.train(history(40))
+    monkeypatch.setattr(ticket_pipeline, "get_fast_classifier", lambda: classifier)
+    monkeypatch.setattr(ticket_pipeline, "classify_and_reply", classify_and_reply)
+    monkeypatch.setattr(ticket_pipeline, "classify_ticket", classify_ticket)
+    return calls
+
+
+def test_uncached_ticket_takes_one_combined_llm_call(llm_calls, monkeypatch):
+    cache = StubCache()
+    monkeypatch.setattr(ticket_pipeline, "get_reply_cache", lambda: cache)
+
+    classification, reply, _ = ticket_pipeline.analyze_ticket("I was charged twice, please refund me")
+
+    assert llm_calls == ["classify_and_reply"]
+    assert (classification["source"], reply) == ("llm", "Refund issued")
+    assert cache.added == ["Refund issued"]
+
+
+def test_cached_reply_with_confident_prediction_skips_the_llm(llm_calls, monkeypatch):
+    monkeypatch.setattr(ticket_pipeline, "get_reply_cache", lambda: StubCache("We refunded you"))
+
+    classification, reply, timings = ticket_pipeline.analyze_ticket("I was charged twice, please refund me")
+
+    assert llm_calls == []
+    assert (classification["source"], reply, timings["llm"]) == ("local", "We refunded you", 0.0)
+
+
+def test_truncated_model_file_is_retrained(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(fast_classifier, "_classifier", None)
+    monkeypatch.setattr(fast_classifier.atexit, "register", lambda fn: None)
+    monkeypatch.setattr(sheet_conector, "fetch_processed_tickets", lambda: history(200))
+    (tmp_path / fast_classifier.MODEL_PATH).write_text('{"n_docs": 200, "doc_fr')
+
+    classifier = fast_classifier.get_fast_classifier()
+
+    assert classifier.n_docs == 200
+    assert FastClassifier.load().n_docs == 200
+    assert not (tmp_path / (fast_classifier.MODEL_PATH + ".tmp")).exists()
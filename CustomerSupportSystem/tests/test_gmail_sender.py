@@ -0,0 +1,82 @@
+import smtplib
+import pytest
+from tools.gmail_sender import SMTPPool, Outbox, build_message
+from tools.smtp_stub import SMTPStubServer
+
+SENDER = "support@example.com"
+
+
+@pytest.fixture
+def stub():
+    server = SMTPStubServer(refuse={"nobody@example.com"}).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pool(stub):
+    pool = SMTPPool("127.0.0.1", stub.port, "user", "secret", size=2, starttls=False, timeout=5)
+    yield pool
+    pool.close()
+
+
+def message(to):
+    return build_message(to, "Regarding Your Support Ticket", "Hello", sender=SENDER)
+
+
+def test_pool_reuses_one_connection(pool, stub):
+    for i in range(5):
+        pool.send(message(f"customer{i}@example.com"))
+
+    assert len(stub.messages) == 5
+    assert stub.connections == 1
+    assert pool.connects == 1
+
+
+def test_pool_reconnects_after_server_drops(pool, stub):
+    pool.send(message("first@example.com"))
+    stub.drop_connections()
+
+    pool.send(message("second@example.com"))
+
+    assert [m["to"] for m in stub.messages] == [["first@example.com"], ["second@example.com"]]
+    assert pool.connects == 2
+
+
+def test_pool_does_not_retry_refused_recipient(pool, stub):
+    with pytest.raises(smtplib.SMTPRecipientsRefused):
+        pool.send(message("nobody@example.com"))
+
+    assert stub.messages == []
+    assert stub.commands.count("MAIL") == 1
+    assert pool.connects == 1
+
+
+def test_outbox_sends_batch_over_one_connection(pool, stub, monkeypatch):
+    monkeypatch.setenv("EMAIL_ADDRESS", SENDER)
+    monkeypatch.setenv("EMAIL_APP_PASSWORD", "secret")
+    outbox = Outbox(pool, backoff=0.01)
+    futures = [outbox.submit(f"customer{i}@example.com", "Subject", "Body") for i in range(4)]
+    futures.append(outbox.submit("nobody@example.com", "Subject", "Body"))
+
+    results = [future.result(timeout=5) for future in futures]
+
+    assert [r["status"] for r in results] == ["success"] * 4 + ["error"]
+    assert len(stub.messages) == 4
+    assert stub.commands.count("MAIL") == 5
+    assert pool.connects == 1
+
+
+def test_outbox_isolates_unexpected_per_message_errors(pool, stub, monkeypatch):
+    monkeypatch.setenv("EMAIL_ADDRESS", SENDER)
+    monkeypatch.setenv("EMAIL_APP_PASSWORD", "secret")
+    outbox = Outbox(pool, backoff=0.01)
+    # The stub does not advertise SMTPUTF8, so this raises SMTPNotSupportedError
+    futures = [outbox.submit(to, "Subject", "Body") for to in ("first@example.com", "jörg@exämple.com", "last@example.com")]
+
+    results = [future.result(timeout=5) for future in futures]
+
+    assert [r["status"] for r in results] == ["success", "error", "success"]
+    assert [m["to"] for m in stub.messages] == [["first@example.com"], ["last@example.com"]]
+    assert pool.connects == 1
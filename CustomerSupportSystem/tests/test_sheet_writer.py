@@ -0,0 +1,85 @@
+import pytest
+from tools import sheet_conector
+from tools.fake_sheets import FakeClient
+from tools.sheet_conector import SheetWriter, _to_ranges
+from tools.ticket_index import TicketIndex
+
+
+def test_to_ranges_merges_contiguous_cells():
+    ranges = _to_ranges({
+        3: {5: "Negative", 7: "Sorry about that"},
+        2: {7: "Reply", 5: "Positive", 6: "Billing"},
+    })
+
+    assert ranges == [
+        {"range": "E2:G2", "values": [["Positive", "Billing", "Reply"]]},
+        {"range": "E3:E3", "values": [["Negative"]]},
+        {"range": "G3:G3", "values": [["Sorry about that"]]},
+    ]
+
+
+@pytest.fixture
+def sheets(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_conector, "_index", TicketIndex(str(tmp_path / "index.db")))
+    monkeypatch.setattr(sheet_conector, "writer", SheetWriter(max_pending=100, max_delay=60))
+    client = FakeClient.with_tickets([
+        ["Ann", "ann@example.com", "Billing", "I was charged twice", "", "", ""],
+        ["Bob", "bob@example.com", "Login", "Cannot log in", "", "", ""],
+    ])
+    sheet_conector.use_client(client)
+    return client.open("SupportTickets").sheet1
+
+
+def pending_rows(reconcile=True):
+    sheet_conector.sync_tickets(force=True, reconcile=reconcile)
+    return [ticket["RowNumber"] for ticket in sheet_conector.fetch_new_tickets()]
+
+
+def test_flush_writes_buffered_updates_in_one_call(sheets):
+    sheet_conector.update_ticket(2, "Negative", "Billing", "Refund issued")
+    sheet_conector.update_ticket(3, "Neutral", "Login", "Reset link sent")
+    sheet_conector.writer.flush()
+
+    assert sheets.calls["batch_update"] == 1
+    assert sheets.rows[1][4:] == ["Negative", "Billing", "Refund issued"]
+    assert sheets.rows[2][4:] == ["Neutral", "Login", "Reset link sent"]
+    assert pending_rows() == []
+
+
+def test_failed_flush_rebuffers_and_hides_row(sheets, monkeypatch):
+    outage = {"on": True}
+    batch_update = sheets.batch_update
+
+    def flaky(data, **kwargs):
+        if outage["on"]:
+            raise ConnectionError("quota exceeded")
+        return batch_update(data, **kwargs)
+
+    monkeypatch.setattr(sheets, "batch_update", flaky)
+    sheet_conector.update_ticket(2, "Negative", "Billing", "Refund issued")
+    sheet_conector.writer.flush()
+
+    # The sheet still shows row 2 unanswered, but it must not be picked up again
+    assert sheets.rows[1][4:] == ["", "", ""]
+    assert sheet_conector.writer.unflushed_rows() == {2}
+    assert pending_rows() == [3]
+
+    outage["on"] = False
+    sheet_conector.writer.flush()
+
+    assert sheets.rows[1][4:] == ["Negative", "Billing", "Refund issued"]
+    assert sheet_conector.writer.unflushed_rows() == set()
+    assert pending_rows() == [3]
+
+
+def test_reconcile_before_flush_keeps_local_answer(sheets):
+    pending_rows()
+    sheet_conector.update_ticket(2, "Negative", "Billing", "Refund issued")
+
+    # The sheet still shows row 2 unanswered; reconciling must not undo mark_processed
+    assert pending_rows(reconcile=True) == [3]
+    sheet_conector.writer.flush()
+
+    # A plain sync never re-reads row 2, so the index has to be right already
+    assert pending_rows(reconcile=False) == [3]
+    assert sheet_conector.get_index().pending()[0]["RowNumber"] == 3
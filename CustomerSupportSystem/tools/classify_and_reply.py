@@ -0,0 +1,125 @@
+import re
+import json
+import threading
+from tools.classify_ticket import classify_ticket
+from tools.generate_reply import generate_reply
+from tools.euri_client import EuriError, get_euri_client, message_content
+
+SENTIMENTS = ["Positive", "Negative", "Neutral"]
+ISSUE_TYPES = ["Billing", "Technical", "Login", "General", "Other"]
+
+RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sentiment": {"type": "string", "enum": SENTIMENTS},
+        "issue_type": {"type": "string", "enum": ISSUE_TYPES},
+        "reply": {"type": "string"}
+    },
+    "required": ["sentiment", "issue_type", "reply"],
+    "additionalProperties": False
+}
+
+# Cleared once the endpoint rejects response_format, so later tickets do not
+# pay for the failing round trip again
+_structured_output = True
+_structured_output_lock = threading.Lock()
+
+def _normalize(value, allowed, default):
+    if isinstance(value, str):
+        for option in allowed:
+            if value.strip().lower() == option.lower():
+                return option
+    return default
+
+def parse_resolution(content: str):
+    """
+    Pull the sentiment/issue_type/reply object out of a model response.
+    Tolerates code fences and text around the JSON; returns None if no
+    usable reply is found.
+    """
+    if not content:
+        return None
+    content = re.sub(r"^```(?:json)?\s*|\s*```$", "", content.strip())
+    start = content.find("{")
+    if start == -1:
+        return None
+    try:
+        parsed, _ = json.JSONDecoder().raw_decode(content[start:])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(parsed, dict):
+        return None
+
+    reply = parsed.get("reply")
+    if not isinstance(reply, str) or not reply.strip():
+        return None
+
+    return {
+        "sentiment": _normalize(parsed.get("sentiment"), SENTIMENTS, "Unknown"),
+        "issue_type": _normalize(parsed.get("issue_type"), ISSUE_TYPES, "General"),
+        "reply": reply.strip()
+    }
+
+def _disable_structured_output():
+    global _structured_output
+    with _structured_output_lock:
+        if _structured_output:
+            print("⚠️ Structured output rejected by the endpoint; sending plain JSON prompts from now on")
+        _structured_output = False
+
+def classify_and_reply(text: str) -> dict:
+    prompt = f"""
+You are a smart and friendly customer support agent.
+
+For the customer ticket below:
+1. Classify the sentiment as one of: Positive, Negative, Neutral
+2. Classify the issue type as one of: Billing, Technical, Login, General, Other
+3. Write the reply to the customer with empathy, clear explanation, and helpful advice.
+
+Respond ONLY with a JSON object like this:
+{{
+    "sentiment": "Negative",
+    "issue_type": "Billing",
+    "reply": "..."
+}}
+
+Customer Ticket:
+\"\"\"{text}\"\"\""""
+
+    payload = {
+        "model": "gpt-4.1-nano",
+        "messages": [
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": 700,
+        "temperature": 0.4
+    }
+    with _structured_output_lock:
+        structured = _structured_output
+    if structured:
+        payload["response_format"] = {
+            "type": "json_schema",
+            "json_schema": {"name": "ticket_resolution", "strict": True, "schema": RESPONSE_SCHEMA}
+        }
+
+    client = get_euri_client()
+    try:
+        try:
+            result = client.complete(payload, label="classify_and_reply")
+        except EuriError as e:
+            if e.status_code != 400 or not structured:
+                raise
+            # Endpoint may not support structured output; the prompt still asks for JSON
+            payload.pop("response_format")
+            result = client.complete(payload, label="classify_and_reply")
+            # The plain request went through, so it was response_format that was rejected
+            _disable_structured_output()
+        parsed = parse_resolution(message_content(result))
+        if parsed:
+            return parsed
+        print("⚠️ Could not parse combined response, falling back to separate calls")
+    except Exception as e:
+        print(f"❌ Classify & reply error: {e}")
+
+    classification = classify_ticket(text)
+    return {**classification, "reply": generate_reply(text)}
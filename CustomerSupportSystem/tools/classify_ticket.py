@@ -1,14 +1,5 @@
-import os
-import requests
 import json
-from dotenv import load_dotenv
-load_dotenv()
-import sys
-
-sys.stdout.reconfigure(encoding='utf-8')
-
-EURI_API_URL = "https://api.euron.one/api/v1/euri/alpha/chat/completions"
-EURI_API_KEY = os.getenv("EURI_API_KEY")
+from tools.euri_client import get_euri_client
 
 def classify_ticket(text: str) -> dict:
         prompt = f"""
@@ -27,24 +18,8 @@ Respond ONLY with a JSON object like this:
 Customer Ticket:
 \"\"\"{text}\"\"\""""
 
-        headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {EURI_API_KEY}"
-        }
-
-        payload = {
-                "model": "gpt-4.1-nano",
-                "messages": [
-                        {"role": "user", "content": prompt}
-                ],
-                "max_tokens": 500,
-                "temperature": 0.3
-        }
-        
         try:
-                response = requests.post(EURI_API_URL, headers=headers, json=payload)
-                result = response.json()
-                content = result["choices"][0]["message"]["content"]
+                content = get_euri_client().chat(prompt, max_tokens=500, temperature=0.3, label="classify_ticket")
                 parsed_result = json.loads(content)
 
                 return({
@@ -0,0 +1,115 @@
+import re
+from collections import Counter
+import gspread
+from gspread.utils import a1_to_rowcol
+
+# In-memory stand-in for the parts of the gspread client used by sheet_conector.
+# Usage:
+#     from tools.fake_sheets import FakeClient
+#     from tools import sheet_conector
+#     sheet_conector.use_client(FakeClient.with_tickets([...]))
+
+TICKET_HEADER = ["Name", "Email", "IssueType", "Message", "Sentiment", "IssueType_Label", "AutoReply"]
+
+
+class FakeWorksheet:
+    def __init__(self, title, rows=None, calls=None):
+        self.title = title
+        self.rows = [list(r) for r in (rows or [])]
+        self.calls = calls if calls is not None else Counter()
+
+    def _set(self, row, col, value):
+        while len(self.rows) < row:
+            self.rows.append([])
+        cells = self.rows[row - 1]
+        while len(cells) < col:
+            cells.append("")
+        cells[col - 1] = value
+
+    def get_all_values(self):
+        self.calls["get_all_values"] += 1
+        return [list(r) for r in self.rows]
+
+    def get_all_records(self):
+        self.calls["get_all_records"] += 1
+        if not self.rows:
+            return []
+        header = self.rows[0]
+        return [
+            {key: (row[i] if i < len(row) else "") for i, key in enumerate(header)}
+            for row in self.rows[1:]
+        ]
+
+    def get(self, range_name):
+        self.calls["get"] += 1
+        match = re.fullmatch(r"([A-Z]+)(\d+):([A-Z]+)(\d*)", range_name)
+        start_row, start_col = a1_to_rowcol(f"{match.group(1)}{match.group(2)}")
+        end_col = a1_to_rowcol(f"{match.group(3)}1")[1]
+        end_row = int(match.group(4)) if match.group(4) else len(self.rows)
+        return [
+            [(row[c] if c < len(row) else "") for c in range(start_col - 1, end_col)]
+            for row in self.rows[start_row - 1:end_row]
+        ]
+
+    def append_row(self, values, **kwargs):
+        self.calls["append_row"] += 1
+        self.rows.append(list(values))
+
+    def append_rows(self, values, **kwargs):
+        self.calls["append_rows"] += 1
+        self.rows.extend(list(v) for v in values)
+
+    def update_cell(self, row, col, value):
+        self.calls["update_cell"] += 1
+        self._set(row, col, value)
+
+    def batch_update(self, data, **kwargs):
+        self.calls["batch_update"] += 1
+        for item in data:
+            start, _, _ = item["range"].partition(":")
+            row, col = a1_to_rowcol(start)
+            for r, values in enumerate(item["values"]):
+                for c, value in enumerate(values):
+                    self._set(row + r, col + c, value)
+
+
+class FakeSpreadsheet:
+    def __init__(self, calls):
+        self.calls = calls
+        self.worksheets = {}
+
+    @property
+    def sheet1(self):
+        return next(iter(self.worksheets.values()))
+
+    def worksheet(self, title):
+        self.calls["worksheet"] += 1
+        if title not in self.worksheets:
+            raise gspread.exceptions.WorksheetNotFound(title)
+        return self.worksheets[title]
+
+    def add_worksheet(self, title, rows, cols):
+        self.calls["add_worksheet"] += 1
+        self.worksheets[title] = FakeWorksheet(title, calls=self.calls)
+        return self.worksheets[title]
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = Counter()
+        self.spreadsheets = {}
+
+    @classmethod
+    def with_tickets(cls, tickets, name="SupportTickets"):
+        """tickets: list of [Name, Email, IssueType, Message, Sentiment, IssueType_Label, AutoReply] rows."""
+        client = cls()
+        spreadsheet = FakeSpreadsheet(client.calls)
+        spreadsheet.worksheets["Sheet1"] = FakeWorksheet("Sheet1", [TICKET_HEADER] + list(tickets), client.calls)
+        client.spreadsheets[name] = spreadsheet
+        return client
+
+    def open(self, name):
+        self.calls["open"] += 1
+        if name not in self.spreadsheets:
+            raise gspread.exceptions.SpreadsheetNotFound(name)
+        return self.spreadsheets[name]
@@ -0,0 +1,259 @@
+import os
+import re
+import json
+import math
+import atexit
+import threading
+from collections import Counter
+
+# Local TF-IDF + naive Bayes classifier for the obvious tickets.
+# It is trained from ProcessedTickets history and updated incrementally as
+# the LLM labels new tickets.
+#
+# Confidence is the log-odds margin between the best and the runner-up
+# label (the smaller of the two label sets). Naive Bayes posteriors
+# saturate near 1.0 on any ticket longer than a few words, so a probability
+# cut-off such as 0.9 lets almost everything through. The margin keeps its
+# resolution, and its threshold is calibrated on held-out history: the
+# smallest margin at which held-out predictions reach TARGET_PRECISION.
+# Predictions below the threshold are escalated to the LLM.
+
+MODEL_PATH = os.getenv("FAST_CLASSIFIER_PATH", "fast_classifier.json")
+# Fixed margin (nats) instead of the calibrated one
+THRESHOLD = float(os.getenv("FAST_CLASSIFIER_THRESHOLD", "inf"))
+TARGET_PRECISION = float(os.getenv("FAST_CLASSIFIER_PRECISION", 0.95))
+MIN_EXAMPLES = int(os.getenv("FAST_CLASSIFIER_MIN_EXAMPLES", 30))
+MIN_HELD_OUT = 20
+HOLDOUT_EVERY = 5
+SAVE_EVERY = 10
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+LABELS = {
+    "sentiment": ["Positive", "Negative", "Neutral"],
+    "issue_type": ["Billing", "Technical", "Login", "General", "Other"]
+}
+
+def tokenize(text: str) -> list[str]:
+    words = TOKEN_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class _LabelModel:
+    """Multinomial naive Bayes over TF-IDF weighted terms for one label set."""
+
+    def __init__(self, labels):
+        self.labels = labels
+        self.class_docs = Counter()
+        self.class_terms = {label: Counter() for label in labels}
+        self.class_totals = Counter()
+
+    def learn(self, term_counts: Counter, label):
+        self.class_docs[label] += 1
+        self.class_terms[label].update(term_counts)
+        self.class_totals[label] += sum(term_counts.values())
+
+    def predict(self, weights: dict, vocab_size: int, alpha=1.0):
+        n_docs = sum(self.class_docs.values())
+        scores = {}
+        for label in self.labels:
+            if not self.class_docs[label]:
+                continue
+            terms = self.class_terms[label]
+            denominator = self.class_totals[label] + alpha * vocab_size
+            score = math.log(self.class_docs[label] / n_docs)
+            for term, weight in weights.items():
+                score += weight * math.log((terms.get(term, 0) + alpha) / denominator)
+            scores[label] = score
+
+        # A label set with one trained class carries no evidence either way
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        margin = scores[ranked[0]] - scores[ranked[1]] if len(ranked) > 1 else 0.0
+        return ranked[0], margin
+
+
+class FastClassifier:
+    def __init__(self, threshold=THRESHOLD, min_examples=MIN_EXAMPLES):
+        self.threshold = threshold
+        self.min_examples = min_examples
+        self.calibration = None
+        self.doc_freq = Counter()
+        self.n_docs = 0
+        self.models = {name: _LabelModel(labels) for name, labels in LABELS.items()}
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+
+    def learn(self, text: str, sentiment: str, issue_type: str, autosave=True):
+        """Add one labelled ticket. Unknown labels are ignored."""
+        if sentiment not in LABELS["sentiment"] or issue_type not in LABELS["issue_type"]:
+            return
+        term_counts = Counter(tokenize(text))
+        if not term_counts:
+            return
+        with self._lock:
+            self.n_docs += 1
+            self.doc_freq.update(term_counts.keys())
+            self.models["sentiment"].learn(term_counts, sentiment)
+            self.models["issue_type"].learn(term_counts, issue_type)
+            self._unsaved += 1
+        if autosave and self._unsaved >= SAVE_EVERY:
+            self.save()
+
+    def train(self, records: list[dict]):
+        """Train from ProcessedTickets rows (Message, Sentiment, IssueType_Label)."""
+        for record in records:
+            self.learn(str(record.get("Message", "")), record.get("Sentiment"), record.get("IssueType_Label"), autosave=False)
+
+    def calibrate(self, records: list[dict], precision=TARGET_PRECISION):
+        """
+        Set the threshold from held-out ProcessedTickets rows.
+        Every HOLDOUT_EVERY-th row is scored by a model trained on the others;
+        the threshold is the smallest margin at which the held-out predictions
+        at or above it get both labels right `precision` of the time. With
+        fewer than MIN_HELD_OUT scored rows, or if no margin is precise
+        enough, everything is escalated.
+        """
+        probe = FastClassifier(min_examples=1)
+        probe.train([r for i, r in enumerate(records) if i % HOLDOUT_EVERY != HOLDOUT_EVERY - 1])
+
+        scored = []
+        for record in records[HOLDOUT_EVERY - 1::HOLDOUT_EVERY]:
+            sentiment, issue_type = record.get("Sentiment"), record.get("IssueType_Label")
+            if sentiment not in LABELS["sentiment"] or issue_type not in LABELS["issue_type"]:
+                continue
+            prediction = probe.predict(str(record.get("Message", "")))
+            if prediction is None:
+                continue
+            correct = prediction["sentiment"] == sentiment and prediction["issue_type"] == issue_type
+            scored.append((prediction["confidence"], correct))
+
+        threshold, kept, hits = math.inf, 0, 0
+        if len(scored) >= MIN_HELD_OUT:
+            scored.sort(key=lambda item: item[0], reverse=True)
+            right = 0
+            for n, (margin, correct) in enumerate(scored, 1):
+                right += correct
+                if right / n >= precision:
+                    threshold, kept, hits = margin, n, right
+
+        self.threshold = threshold
+        self.calibration = {
+            "held_out": len(scored),
+            "target_precision": precision,
+            "precision": round(hits / kept, 4) if kept else None,
+            "coverage": round(kept / len(scored), 4) if scored else None
+        }
+        return self.threshold
+
+    def predict(self, text: str):
+        """Return {"sentiment", "issue_type", "confidence" (log-odds margin)}, or None if untrained."""
+        with self._lock:
+            if self.n_docs < self.min_examples:
+                return None
+            term_counts = Counter(tokenize(text))
+            # Terms never seen in training carry no evidence for any class
+            weights = {
+                term: count * (math.log((1 + self.n_docs) / (1 + self.doc_freq[term])) + 1)
+                for term, count in term_counts.items() if term in self.doc_freq
+            }
+            vocab_size = len(self.doc_freq)
+            sentiment, sentiment_margin = self.models["sentiment"].predict(weights, vocab_size)
+            issue_type, issue_margin = self.models["issue_type"].predict(weights, vocab_size)
+
+        return {"sentiment": sentiment, "issue_type": issue_type, "confidence": round(min(sentiment_margin, issue_margin), 4)}
+
+    def try_classify(self, text: str):
+        """Return a confident local prediction, or None to escalate to the LLM."""
+        prediction = self.predict(text)
+        with self._lock:
+            self.stats["total"] += 1
+            if prediction is None or prediction["confidence"] < self.threshold:
+                self.stats["escalated"] += 1
+                return None
+            self.stats["local"] += 1
+        return prediction
+
+    def classify(self, text: str, escalate) -> dict:
+        """Classify locally if confident, else call `escalate(text)` and learn from its answer."""
+        prediction = self.try_classify(text)
+        if prediction:
+            return {"sentiment": prediction["sentiment"], "issue_type": prediction["issue_type"], "source": "local"}
+        result = escalate(text)
+        self.learn(text, result.get("sentiment"), result.get("issue_type"))
+        return {"sentiment": result.get("sentiment"), "issue_type": result.get("issue_type"), "source": "llm"}
+
+    def report(self) -> dict:
+        total = self.stats["total"]
+        return {
+            "threshold": self.threshold,
+            "calibration": self.calibration,
+            "trained_examples": self.n_docs,
+            "total": total,
+            "local": self.stats["local"],
+            "escalated": self.stats["escalated"],
+            "escalation_rate": round(self.stats["escalated"] / total, 4) if total else None
+        }
+
+    def save(self, path=MODEL_PATH):
+        with self._lock:
+            state = {
+                "threshold": self.threshold,
+                "calibration": self.calibration,
+                "n_docs": self.n_docs,
+                "doc_freq": self.doc_freq,
+                "models": {
+                    name: {"class_docs": m.class_docs, "class_terms": m.class_terms, "class_totals": m.class_totals}
+                    for name, m in self.models.items()
+                }
+            }
+            # Written aside and swapped in, so a crash mid-save never leaves a truncated model
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(path + ".tmp", path)
+            self._unsaved = 0
+
+    @classmethod
+    def load(cls, path=MODEL_PATH, **kwargs):
+        classifier = cls(**kwargs)
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if "FAST_CLASSIFIER_THRESHOLD" not in os.environ:
+            classifier.threshold = state.get("threshold", math.inf)
+        classifier.calibration = state.get("calibration")
+        classifier.n_docs = state["n_docs"]
+        classifier.doc_freq = Counter(state["doc_freq"])
+        for name, m in state["models"].items():
+            model = classifier.models[name]
+            model.class_docs = Counter(m["class_docs"])
+            model.class_terms = {label: Counter(m["class_terms"].get(label, {})) for label in model.labels}
+            model.class_totals = Counter(m["class_totals"])
+        return classifier
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+def get_fast_classifier() -> FastClassifier:
+    """
+    Load the saved model, or train and calibrate one from the ProcessedTickets
+    history on first use or if the saved model cannot be read. Delete
+    MODEL_PATH to retrain and recalibrate.
+    """
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            if os.path.exists(MODEL_PATH):
+                try:
+                    _classifier = FastClassifier.load()
+                except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                    print(f"⚠️ Could not load {MODEL_PATH} ({e}); retraining")
+            if _classifier is None:
+                from tools.sheet_conector import fetch_processed_tickets
+                records = fetch_processed_tickets()
+                _classifier = FastClassifier()
+                if "FAST_CLASSIFIER_THRESHOLD" not in os.environ:
+                    _classifier.calibrate(records)
+                _classifier.train(records)
+                _classifier.save()
+            atexit.register(_classifier.save)
+        return _classifier
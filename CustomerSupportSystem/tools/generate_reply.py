@@ -1,13 +1,6 @@
-import os
-import requests
-from dotenv import load_dotenv
-load_dotenv()
-import sys
+from tools.euri_client import get_euri_client
 
-sys.stdout.reconfigure(encoding='utf-8')
-
-EURI_API_URL = "https://api.euron.one/api/v1/euri/alpha/chat/completions"
-EURI_API_KEY = os.getenv("EURI_API_KEY")
+FALLBACK_REPLY = "We’re experiencing some technical issues. Our support team will respond as soon as possible."
 
 def generate_reply(text:str)->str:
     prompt = f"""
@@ -21,24 +14,9 @@ Issue:
 Only return the final response message.
 """
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {EURI_API_KEY}"
-    }
-
-    payload = {
-        "model": "gpt-4.1-nano",
-        "messages": [
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 500,
-        "temperature": 0.5
-    }
-
     try:
-        response = requests.post(EURI_API_URL, headers=headers, json=payload)
-        result = response.json()
-        return result["choices"][0]["message"]["content"].strip()
+        content = get_euri_client().chat(prompt, max_tokens=500, temperature=0.5, label="generate_reply")
+        return content.strip()
     except Exception as e:
         print("❌ Reply Generation Error:", e)
-        return "We’re experiencing some technical issues. Our support team will respond as soon as possible."
+        return FALLBACK_REPLY
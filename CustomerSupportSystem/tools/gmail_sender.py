@@ -1,42 +1,237 @@
 import os
+import time
+import queue
+import random
+import socket
 import smtplib
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
-sys.stdout.reconfigure(encoding='utf-8')
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", 2))
 
-EMAIL_ADDRESS = os.getenv("EMAIL_ADDRESS")
-EMAIL_APP_PASSWORD = os.getenv("EMAIL_APP_PASSWORD")
+# Only a lost connection is worth retrying. Every SMTPException is also an
+# OSError, so catching OSError would retry refused recipients, rejected
+# data and bad credentials too, and could resend a half-delivered message.
+RETRYABLE_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, socket.timeout)
 
-if not EMAIL_ADDRESS or not EMAIL_APP_PASSWORD:
-    raise ValueError("❌ EMAIL_ADDRESS or EMAIL_APP_PASSWORD not found in .env")
+def get_credentials():
+    """Read the Gmail credentials when first needed, so importing this module never fails."""
+    email_address = os.getenv("EMAIL_ADDRESS")
+    app_password = os.getenv("EMAIL_APP_PASSWORD")
+    if not email_address or not app_password:
+        raise ValueError("❌ EMAIL_ADDRESS or EMAIL_APP_PASSWORD not found in .env")
+    return email_address, app_password
 
-print("🔐 Loaded credentials:")
-print("Email:", EMAIL_ADDRESS)
-print("App Password (length):", len(EMAIL_APP_PASSWORD))
+def build_message(to, subject, body, sender=None):
+    msg = MIMEMultipart()
+    msg['From'] = sender or get_credentials()[0]
+    msg['To'] = to
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
 
-def send_email_smtp(to, subject, body):
-    try:
-        msg = MIMEMultipart()
-        msg['From'] = EMAIL_ADDRESS
-        msg['To'] = to
-        msg['Subject'] = subject
-        msg.attach(MIMEText(body, 'plain'))
-
-        print(f"📡 Connecting to smtp.gmail.com to send email to {to}...")
-        server = smtplib.SMTP('smtp.gmail.com', 587)
+
+class SMTPPool:
+    """
+    Keeps up to `size` authenticated SMTP connections open and hands them out
+    one caller at a time. Connections idle longer than `check_after` seconds
+    are probed with NOOP before reuse and replaced if the server dropped them.
+    """
+
+    def __init__(self, host, port, username=None, password=None, size=2, starttls=True, timeout=30, check_after=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.check_after = check_after
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connects = 0
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
         server.set_debuglevel(0)  # Set to 1 to enable full SMTP debug
-        server.starttls()
-        server.login(EMAIL_ADDRESS, EMAIL_APP_PASSWORD)
-        server.send_message(msg)
-        server.quit()
+        if self.starttls:
+            server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        self.connects += 1
+        return server
+
+    def _take(self):
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < self.check_after:
+                return server
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            _close(server)
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        server = None
+        try:
+            server = self._take()
+            yield server
+        except Exception:
+            if server is not None:
+                _close(server)
+                server = None
+            raise
+        finally:
+            if server is not None:
+                self._idle.put((server, time.monotonic()))
+            self._slots.release()
+
+    def send(self, msg, attempts=2):
+        """Send one message, reconnecting once if the pooled connection went stale."""
+        for attempt in range(attempts):
+            try:
+                with self.connection() as server:
+                    server.send_message(msg)
+                return
+            except RETRYABLE_ERRORS:
+                if attempt == attempts - 1:
+                    raise
+
+    def close(self):
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                server.quit()
+            except Exception:
+                _close(server)
+
+
+def _close(server):
+    try:
+        server.close()
+    except Exception:
+        pass
+
+
+class Outbox:
+    """
+    Background sender. Queued emails are drained in batches of up to
+    `batch_size`, each batch over a single pooled connection. Messages
+    that failed on a lost connection are retried with jittered exponential
+    backoff; any other error is final for the one message it hit.
+    """
 
+    def __init__(self, pool, batch_size=20, max_retries=3, backoff=1.0):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="smtp-outbox", daemon=True)
+        self._thread.start()
+
+    def submit(self, to, subject, body) -> Future:
+        future = Future()
+        self._queue.put((build_message(to, subject, body), to, future, 0))
+        return future
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            error = None
+            try:
+                with self.pool.connection() as server:
+                    for msg, to, future, attempt in batch:
+                        try:
+                            server.send_message(msg)
+                            future.set_result({"status": "success", "message": f"Email sent to {to}"})
+                        except RETRYABLE_ERRORS:
+                            raise
+                        except Exception as e:
+                            # Refused, unsupported or malformed: final for this message only
+                            print(f"❌ Failed to send email to {to}: {e}")
+                            future.set_result({"status": "error", "message": str(e)})
+            except Exception as e:
+                # The connection is dropped; unsent messages are retried only if it was lost
+                error = e
+
+            for msg, to, future, attempt in batch:
+                if future.done():
+                    continue
+                if attempt + 1 >= self.max_retries or not isinstance(error, RETRYABLE_ERRORS):
+                    print(f"❌ Failed to send email to {to}: {error}")
+                    future.set_result({"status": "error", "message": str(error)})
+                else:
+                    delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+                    timer = threading.Timer(delay, self._queue.put, args=((msg, to, future, attempt + 1),))
+                    timer.daemon = True
+                    timer.start()
+
+
+_pool = None
+_outbox = None
+_init_lock = threading.Lock()
+
+def get_pool() -> SMTPPool:
+    global _pool
+    with _init_lock:
+        if _pool is None:
+            email_address, app_password = get_credentials()
+            print("🔐 Loaded credentials:")
+            print("Email:", email_address)
+            print("App Password (length):", len(app_password))
+            _pool = SMTPPool(SMTP_HOST, SMTP_PORT, email_address, app_password, size=SMTP_POOL_SIZE, starttls=SMTP_STARTTLS)
+        return _pool
+
+def get_outbox() -> Outbox:
+    global _outbox
+    pool = get_pool()
+    with _init_lock:
+        if _outbox is None:
+            _outbox = Outbox(pool)
+        return _outbox
+
+def warm_up():
+    """Open and authenticate one pooled connection ahead of the first email."""
+    with get_pool().connection():
+        pass
+
+def send_email_smtp(to, subject, body):
+    try:
+        get_pool().send(build_message(to, subject, body))
         print("✅ Email sent successfully to:", to)
         return {"status": "success", "message": f"Email sent to {to}"}
     except Exception as e:
         print("❌ Failed to send email:", e)
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+        return {"status": "error", "message": str(e)}
+
+def queue_email(to, subject, body) -> Future:
+    """Hand an email to the background outbox; the future resolves to the same dict as send_email_smtp."""
+    return get_outbox().submit(to, subject, body)
@@ -0,0 +1,94 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Local ledger of resolved tickets so a retried tool call does not email the
+# customer twice. Each ticket is claimed under an idempotency key before any
+# work starts. A key that is already done returns the stored result. A key
+# still in progress is left alone unless its claim is older than STALE_AFTER
+# seconds, which means the process that claimed it died.
+#
+# Side effects that must not repeat (the sheet row) are recorded as steps on
+# the claim. A released or stale claim keeps its steps, so whoever claims the
+# key next can skip what already happened.
+
+DB_PATH = os.getenv("IDEMPOTENCY_LEDGER_DB", "idempotency_ledger.db")
+STALE_AFTER = float(os.getenv("IDEMPOTENCY_STALE_AFTER", 600))
+
+def idempotency_key(email: str, message: str) -> str:
+    raw = f"{email.strip().lower()}\x1f{' '.join(message.split())}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class IdempotencyLedger:
+    def __init__(self, path=DB_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ledger (
+                key TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                result TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(ledger)")}
+        if "steps" not in columns:
+            self._conn.execute("ALTER TABLE ledger ADD COLUMN steps TEXT")
+
+    def claim(self, key: str):
+        """
+        Try to take ownership of `key`.
+        Returns ("claimed", steps), ("done", result) or ("in_progress", None),
+        where steps are those recorded by earlier, unfinished attempts.
+        """
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock so two processes cannot both claim
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT status, result, updated_at, steps FROM ledger WHERE key = ?", (key,)).fetchone()
+                if row and row[0] == "done":
+                    self._conn.execute("COMMIT")
+                    return "done", json.loads(row[1])
+                if row and row[0] == "in_progress" and now - row[2] < STALE_AFTER:
+                    self._conn.execute("COMMIT")
+                    return "in_progress", None
+                if row:
+                    self._conn.execute("UPDATE ledger SET status = 'in_progress', updated_at = ? WHERE key = ?", (now, key))
+                else:
+                    self._conn.execute(
+                        "INSERT INTO ledger (key, status, result, updated_at) VALUES (?, 'in_progress', NULL, ?)",
+                        (key, now)
+                    )
+                self._conn.execute("COMMIT")
+                return "claimed", json.loads(row[3]) if row and row[3] else {}
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def complete(self, key: str, result: dict):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE ledger SET status = 'done', result = ?, updated_at = ? WHERE key = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), key)
+            )
+
+    def record_step(self, key: str, step: str, value=True):
+        """Note that `step` of an in-progress ticket happened, with any data a retry needs."""
+        with self._lock:
+            row = self._conn.execute("SELECT steps FROM ledger WHERE key = ?", (key,)).fetchone()
+            steps = json.loads(row[0]) if row and row[0] else {}
+            steps[step] = value
+            self._conn.execute(
+                "UPDATE ledger SET steps = ?, updated_at = ? WHERE key = ?",
+                (json.dumps(steps, ensure_ascii=False), time.time(), key)
+            )
+
+    def release(self, key: str):
+        """Give up a failed claim so the ticket can be retried; recorded steps are kept."""
+        with self._lock:
+            self._conn.execute("UPDATE ledger SET status = 'released', updated_at = ? WHERE key = ? AND status = 'in_progress'", (time.time(), key))
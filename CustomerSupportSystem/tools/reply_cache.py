@@ -0,0 +1,146 @@
+import os
+import re
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from tools.generate_reply import FALLBACK_REPLY
+
+# Near-duplicate reply cache. Each answered ticket is fingerprinted with a
+# 64-bit SimHash over character 4-grams. A new message within MAX_DISTANCE
+# bits of an earlier one reuses that ticket's reply.
+#
+# Lookup does not scan every entry. The fingerprint is split into
+# MAX_DISTANCE + 1 bands. Two fingerprints within MAX_DISTANCE bits must
+# agree exactly on at least one band, so only entries sharing a band are
+# compared.
+
+MAX_DISTANCE = int(os.getenv("REPLY_CACHE_MAX_DISTANCE", 6))
+MAX_ENTRIES = int(os.getenv("REPLY_CACHE_MAX_ENTRIES", 5000))
+MIN_LENGTH = 20     # very short messages are too ambiguous to reuse replies for
+SHINGLE = 4
+BITS = 64
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9 ]", " ", text.lower())).strip()
+
+def simhash(text: str) -> int:
+    text = _normalize(text)
+    shingles = Counter(text[i:i + SHINGLE] for i in range(max(1, len(text) - SHINGLE + 1)))
+    vector = [0] * BITS
+    for shingle, weight in shingles.items():
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            vector[bit] += weight if h >> bit & 1 else -weight
+    return sum(1 << bit for bit in range(BITS) if vector[bit] > 0)
+
+def _band_masks(n_bands):
+    masks, start = [], 0
+    for i in range(n_bands):
+        width = BITS // n_bands + (1 if i < BITS % n_bands else 0)
+        masks.append(((1 << width) - 1) << start)
+        start += width
+    return masks
+
+def is_fallback(reply: str) -> bool:
+    """True for the canned technical-issues reply, however the sheet stored its apostrophe."""
+    return reply.strip().replace("\u2019", "'") == FALLBACK_REPLY.replace("\u2019", "'")
+
+def personalize(reply: str, old_name: str, new_name: str) -> str:
+    """Swap the original customer's name for the new one."""
+    if not old_name or not new_name or old_name == new_name:
+        return reply
+    return re.sub(rf"\b{re.escape(old_name)}\b", new_name, reply)
+
+
+class ReplyCache:
+    def __init__(self, max_distance=MAX_DISTANCE, max_entries=MAX_ENTRIES):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self._masks = _band_masks(max_distance + 1)
+        self._entries = OrderedDict()    # fingerprint -> (reply, name), oldest first
+        self._bands = [dict() for _ in self._masks]    # band value -> set of fingerprints
+        self._lock = threading.Lock()
+        self.stats = Counter()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _candidates(self, fingerprint):
+        found = set()
+        for band, mask in zip(self._bands, self._masks):
+            found |= band.get(fingerprint & mask, set())
+        return found
+
+    def lookup(self, message: str, name: str = None):
+        """Return a cached reply for a near-duplicate message, or None."""
+        if len(message) < MIN_LENGTH:
+            return None
+        fingerprint = simhash(message)
+        with self._lock:
+            best, best_distance = None, self.max_distance + 1
+            for candidate in self._candidates(fingerprint):
+                distance = (candidate ^ fingerprint).bit_count()
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+            if best is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._entries.move_to_end(best)
+            reply, cached_name = self._entries[best]
+        return personalize(reply, cached_name, name)
+
+    def add(self, message: str, reply: str, name: str = None):
+        # The fallback reply is not an answer; serving it to near-duplicates would spread an outage
+        if len(message) < MIN_LENGTH or not reply or is_fallback(reply):
+            return
+        fingerprint = simhash(message)
+        with self._lock:
+            if fingerprint not in self._entries:
+                for band, mask in zip(self._bands, self._masks):
+                    band.setdefault(fingerprint & mask, set()).add(fingerprint)
+            self._entries[fingerprint] = (reply, name)
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        fingerprint, _ = self._entries.popitem(last=False)
+        for band, mask in zip(self._bands, self._masks):
+            bucket = band.get(fingerprint & mask)
+            if bucket:
+                bucket.discard(fingerprint)
+                if not bucket:
+                    del band[fingerprint & mask]
+        self.stats["evictions"] += 1
+
+    def seed(self, records: list[dict]):
+        """Load previously answered tickets from ProcessedTickets rows."""
+        for record in records:
+            self.add(str(record.get("Message", "")), str(record.get("AutoReply") or ""), record.get("Name"))
+
+    def report(self) -> dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_distance": self.max_distance,
+            "hits": self.stats["hits"],
+            "misses": self.stats["misses"],
+            "evictions": self.stats["evictions"],
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else None
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_reply_cache() -> ReplyCache:
+    """Build the cache on first use, seeded from the ProcessedTickets history."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from tools.sheet_conector import fetch_processed_tickets
+            _cache = ReplyCache()
+            _cache.seed(fetch_processed_tickets())
+        return _cache
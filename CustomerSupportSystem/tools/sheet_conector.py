@@ -1,39 +1,232 @@
 import os
+import time
+import atexit
+import threading
 import gspread
+from gspread.utils import rowcol_to_a1
 from oauth2client.service_account import ServiceAccountCredentials
-import sys
-sys.stdout.reconfigure(encoding='utf-8')
+from tools.ticket_index import TicketIndex
+
 scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-creds = ServiceAccountCredentials.from_json_keyfile_name("google_creds.json", scope)
-client = gspread.authorize(creds)
+CREDS_FILE = os.getenv("GOOGLE_CREDS_FILE", "google_creds.json")
+
+SPREADSHEET_NAME = "SupportTickets"
+PROCESSED_SHEET = "ProcessedTickets"
+PROCESSED_HEADER = ["Name", "Email", "IssueType", "Message", "Sentiment", "IssueType_Label", "AutoReply"]
+
+# Seconds a get_all_records() result is reused before hitting the API again
+READ_TTL = float(os.getenv("SHEET_READ_TTL", 10))
+
+client = None
+_client_lock = threading.Lock()
+_worksheets = {}
+_worksheets_lock = threading.Lock()
+_records_cache = {}
+
+_index = None
+_index_lock = threading.Lock()
+_last_sync = 0.0
+
+def get_client():
+    """Authorize with Google on first use rather than at import."""
+    global client
+    with _client_lock:
+        if client is None:
+            creds = ServiceAccountCredentials.from_json_keyfile_name(CREDS_FILE, scope)
+            client = gspread.authorize(creds)
+        return client
+
+def get_index() -> TicketIndex:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = TicketIndex()
+        return _index
+
+def warm_up():
+    """Authorize and open both worksheets ahead of the first request."""
+    get_worksheet()
+    get_worksheet(PROCESSED_SHEET)
+
+def get_worksheet(title=None):
+    """Return a cached worksheet handle; None means the first sheet."""
+    key = title or "sheet1"
+    with _worksheets_lock:
+        if key not in _worksheets:
+            workbook = get_client().open(SPREADSHEET_NAME)
+            if title is None:
+                _worksheets[key] = workbook.sheet1
+            else:
+                try:
+                    _worksheets[key] = workbook.worksheet(title)
+                except gspread.exceptions.WorksheetNotFound:
+                    worksheet = workbook.add_worksheet(title=title, rows="1000", cols="10")
+                    if title == PROCESSED_SHEET:
+                        worksheet.append_row(PROCESSED_HEADER)
+                    _worksheets[key] = worksheet
+        return _worksheets[key]
+
+def get_records(title=None, force=False):
+    key = title or "sheet1"
+    cached = _records_cache.get(key)
+    if not force and cached and time.monotonic() - cached[0] < READ_TTL:
+        return cached[1]
+    records = get_worksheet(title).get_all_records()
+    _records_cache[key] = (time.monotonic(), records)
+    return records
+
+def invalidate_records(title=None):
+    _records_cache.pop(title or "sheet1", None)
+
+def use_client(new_client):
+    """Swap the gspread client (e.g. for tools.fake_sheets.FakeClient) and drop cached handles."""
+    global client
+    writer.flush()
+    with _client_lock:
+        client = new_client
+    with _worksheets_lock:
+        _worksheets.clear()
+    _records_cache.clear()
+    get_index().reset()
+
+
+class SheetWriter:
+    """
+    Buffers ticket cell updates and processed-ticket rows, then writes them
+    with one batch_update and one append_rows call. A flush happens when
+    max_pending writes are queued or max_delay seconds after the first one.
+    Updates that fail are re-buffered for the next flush; until they land,
+    unflushed_rows() reports their rows so they are not picked up as new.
+    """
 
-sheet = client.open("SupportTickets").sheet1
+    def __init__(self, max_pending=50, max_delay=5.0):
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self._updates = {}      # row_number -> {col: value}
+        self._appends = []
+        self._in_flight = set()  # rows being written by a flush right now
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def pending(self):
+        with self._lock:
+            return len(self._updates) + len(self._appends)
+
+    def unflushed_rows(self) -> set:
+        """Rows whose updates have not reached the sheet yet."""
+        with self._lock:
+            return set(self._updates) | self._in_flight
+
+    def update_row(self, row_number, values: dict):
+        with self._lock:
+            self._updates.setdefault(row_number, {}).update(values)
+        self._after_enqueue()
+
+    def append_processed(self, row: list):
+        with self._lock:
+            self._appends.append(row)
+        self._after_enqueue()
+
+    def _after_enqueue(self):
+        if self.pending() >= self.max_pending:
+            self.flush()
+            return
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            updates, self._updates = self._updates, {}
+            appends, self._appends = self._appends, []
+            self._in_flight |= set(updates)
+
+        if updates:
+            try:
+                get_worksheet().batch_update(_to_ranges(updates))
+                invalidate_records()
+                print(f"✅ Updated {len(updates)} row(s): {sorted(updates)}")
+            except Exception as e:
+                print(f"❌ Error updating rows {sorted(updates)}: {e}")
+                with self._lock:
+                    for row_number, values in updates.items():
+                        self._updates.setdefault(row_number, values)
+            finally:
+                with self._lock:
+                    self._in_flight -= set(updates)
+
+        if appends:
+            try:
+                get_worksheet(PROCESSED_SHEET).append_rows(appends)
+                invalidate_records(PROCESSED_SHEET)
+                print(f"✅ Appended {len(appends)} processed ticket(s)")
+            except Exception as e:
+                print(f"❌ Error appending processed tickets: {e}")
+                with self._lock:
+                    self._appends = appends + self._appends
+
+
+def _to_ranges(updates):
+    """Turn {row: {col: value}} into batch_update ranges of contiguous cells."""
+    ranges = []
+    for row_number, values in sorted(updates.items()):
+        cols = sorted(values)
+        start = cols[0]
+        for prev, col in zip(cols, cols[1:] + [None]):
+            if col != prev + 1:
+                ranges.append({
+                    "range": f"{rowcol_to_a1(row_number, start)}:{rowcol_to_a1(row_number, prev)}",
+                    "values": [[values[c] for c in range(start, prev + 1)]]
+                })
+                start = col
+    return ranges
+
+
+writer = SheetWriter(
+    max_pending=int(os.getenv("SHEET_WRITE_BATCH", 50)),
+    max_delay=float(os.getenv("SHEET_WRITE_DELAY", 5))
+)
+atexit.register(writer.flush)
+
+def sync_tickets(force=False, reconcile=None):
+    """Bring the local ticket index up to date; throttled to once per READ_TTL."""
+    global _last_sync
+    if not force and time.monotonic() - _last_sync < READ_TTL:
+        return None
+    # Taken before the sheet is read, so a row flushed mid-read is still protected
+    unflushed = writer.unflushed_rows()
+    stats = get_index().sync(get_worksheet(), reconcile=reconcile, skip_rows=unflushed)
+    _last_sync = time.monotonic()
+    return stats
 
 def fetch_new_tickets():
-    data = sheet.get_all_records()
-    return [row for row in data if row['Sentiment'] == "" or row['AutoReply'] == ""]
+    sync_tickets()
+    # A ticket whose status update has not been written yet still looks new
+    # in the sheet, but it was already answered and emailed
+    unflushed = writer.unflushed_rows()
+    return [ticket for ticket in get_index().pending() if ticket["RowNumber"] not in unflushed]
+
+def fetch_processed_tickets():
+    return get_records(PROCESSED_SHEET)
 
 def append_ticket_to_sheet(name, email, issue_type, message):
-    sheet.append_row([name, email, issue_type, message, "", "", ""])
+    get_worksheet().append_row([name, email, issue_type, message, "", "", ""])
 
 def update_ticket(row_number, sentiment, issue_type, reply):
-    try:
-        sheet.update_cell(row_number, 5, sentiment)     # Sentiment → E
-        sheet.update_cell(row_number, 6, issue_type)    # IssueType_Label → F
-        sheet.update_cell(row_number, 7, reply)         # AutoReply → G
-        print(f"✅ Updated Row {row_number}")
-    except Exception as e:
-        print(f"❌ Error updating row {row_number}: {e}")
+    writer.update_row(row_number, {
+        5: sentiment,   # Sentiment → E
+        6: issue_type,  # IssueType_Label → F
+        7: reply        # AutoReply → G
+    })
+    get_index().mark_processed(row_number, sentiment, issue_type, reply)
 
 def append_processed_ticket(ticket, sentiment, issue_type, reply):
-    try:
-        workbook = client.open("SupportTickets")
-        sheet = workbook.worksheet("ProcessedTickets")  # Make sure this tab exists
-    except gspread.exceptions.WorksheetNotFound:
-        sheet = workbook.add_worksheet(title="ProcessedTickets", rows="1000", cols="10")
-        sheet.append_row(["Name", "Email", "IssueType", "Message", "Sentiment", "IssueType_Label", "AutoReply"])
-
-    sheet.append_row([
+    writer.append_processed([
         ticket["Name"],
         ticket["Email"],
         ticket["IssueType"],
@@ -41,4 +234,4 @@ def append_processed_ticket(ticket, sentiment, issue_type, reply):
         sentiment,
         issue_type,
         reply
-    ])
\ No newline at end of file
+    ])
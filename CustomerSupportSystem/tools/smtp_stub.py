@@ -0,0 +1,112 @@
+import time
+import socket
+import threading
+import socketserver
+
+# Minimal local SMTP server stand-in for exercising tools.gmail_sender without
+# Gmail. It accepts any AUTH PLAIN login, does not offer STARTTLS (use
+# SMTP_STARTTLS=0), and keeps every received message in memory.
+#
+# `latency` adds a delay to every reply to mimic the network round trip
+# to a remote mail server. Recipients in `refuse` get a 550 at RCPT, and
+# drop_connections() closes every open session the way a server timing out
+# idle clients would.
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.open_sockets.add(self.connection)
+        try:
+            self._session()
+        finally:
+            with self.server.lock:
+                self.server.open_sockets.discard(self.connection)
+
+    def _session(self):
+        self.reply("220 smtp-stub ready")
+        mail_from, rcpt_to = None, []
+
+        for raw in self.rfile:
+            command = raw.decode("utf-8", "replace").rstrip("\r\n")
+            verb = command.split(" ", 1)[0].upper()
+            with self.server.lock:
+                self.server.commands.append(verb)
+
+            if verb == "EHLO":
+                self.wfile.write(b"250-smtp-stub\r\n250-AUTH PLAIN\r\n")
+                self.reply("250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 smtp-stub")
+            elif verb == "AUTH":
+                self.reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, rcpt_to = command[10:].strip("<> "), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipient = command[8:].strip("<> ")
+                if recipient in self.server.refuse:
+                    self.reply("550 5.1.1 No such user")
+                    continue
+                rcpt_to.append(recipient)
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                for data_line in self.rfile:
+                    if data_line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(data_line)
+                with self.server.lock:
+                    self.server.messages.append({"from": mail_from, "to": rcpt_to, "data": b"".join(lines)})
+                self.reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class SMTPStubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, refuse=()):
+        super().__init__((host, port), _SMTPHandler)
+        self.latency = latency
+        self.refuse = set(refuse)
+        self.lock = threading.Lock()
+        self.messages = []
+        self.commands = []
+        self.connections = 0
+        self.open_sockets = set()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def drop_connections(self):
+        with self.lock:
+            sockets = list(self.open_sockets)
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == "__main__":
+    server = SMTPStubServer(port=1025)
+    print(f"📭 SMTP stub listening on 127.0.0.1:{server.port}")
+    server.serve_forever()
@@ -0,0 +1,31 @@
+import time
+
+# Nothing in tools/ touches the network at import time. warm_up() does the
+# expensive first-use work explicitly, so long-running processes can pay for
+# it before their first ticket instead of during it.
+
+def warm_up(sheets=True, smtp=True, models=True) -> dict:
+    """Initialize clients ahead of time; returns seconds spent per stage."""
+    timings = {}
+
+    if sheets:
+        from tools import sheet_conector
+        start = time.perf_counter()
+        sheet_conector.warm_up()
+        timings["sheets"] = round(time.perf_counter() - start, 3)
+
+    if smtp:
+        from tools import gmail_sender
+        start = time.perf_counter()
+        gmail_sender.warm_up()
+        timings["smtp"] = round(time.perf_counter() - start, 3)
+
+    if models:
+        from tools.fast_classifier import get_fast_classifier
+        from tools.reply_cache import get_reply_cache
+        start = time.perf_counter()
+        get_fast_classifier()
+        get_reply_cache()
+        timings["models"] = round(time.perf_counter() - start, 3)
+
+    return timings
@@ -0,0 +1,125 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+# Local SQLite mirror of the SupportTickets sheet.
+# A normal sync only downloads rows appended after the last synced row.
+# A reconcile pass, run every RECONCILE_INTERVAL seconds, re-reads the
+# synced rows and rewrites only those whose content hash changed. Rows we
+# answered ourselves are left alone while the sheet may still lag behind:
+# rows whose update is still buffered (`skip_rows`) and rows marked
+# processed locally after the re-read started.
+
+DB_PATH = os.getenv("TICKET_INDEX_DB", "ticket_index.db")
+RECONCILE_INTERVAL = float(os.getenv("TICKET_INDEX_RECONCILE", 600))
+
+COLUMNS = ["Name", "Email", "IssueType", "Message", "Sentiment", "IssueType_Label", "AutoReply"]
+LAST_COLUMN = "G"
+
+def _content_hash(values: list) -> str:
+    return hashlib.sha1("\x1f".join(str(v) for v in values).encode("utf-8")).hexdigest()
+
+def _pad(values: list) -> list:
+    return (list(values) + [""] * len(COLUMNS))[:len(COLUMNS)]
+
+
+class TicketIndex:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                row_number INTEGER PRIMARY KEY,
+                name TEXT, email TEXT, issue_type TEXT, message TEXT,
+                sentiment TEXT, issue_label TEXT, auto_reply TEXT,
+                content_hash TEXT NOT NULL,
+                synced_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tickets_pending ON tickets (sentiment, auto_reply);
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._conn.commit()
+
+    def _meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _upsert(self, row_number, values, now):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO tickets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (row_number, *values, _content_hash(values), now)
+        )
+
+    @property
+    def last_synced_row(self) -> int:
+        with self._lock:
+            return int(self._meta("last_synced_row", 1))    # row 1 is the header
+
+    def sync(self, worksheet, reconcile=None, skip_rows=()) -> dict:
+        """
+        Pull appended rows (and changed rows when reconciling) from the worksheet.
+        `skip_rows` are rows with local writes not yet in the sheet; reconcile keeps their local copy.
+        """
+        now = time.time()
+        with self._lock:
+            last = int(self._meta("last_synced_row", 1))
+            last_reconcile = float(self._meta("last_reconcile", 0))
+        if reconcile is None:
+            reconcile = now - last_reconcile >= RECONCILE_INTERVAL
+
+        appended = worksheet.get(f"A{last + 1}:{LAST_COLUMN}")
+        changed_rows = worksheet.get(f"A2:{LAST_COLUMN}{last}") if reconcile and last > 1 else []
+
+        changed = 0
+        with self._lock:
+            if changed_rows:
+                local = {row[0]: row[1:] for row in self._conn.execute("SELECT row_number, content_hash, synced_at FROM tickets")}
+                for row_number, values in enumerate(changed_rows, start=2):
+                    values = _pad(values)
+                    content_hash, synced_at = local.get(row_number, (None, 0))
+                    if row_number in skip_rows or synced_at >= now:
+                        continue
+                    if content_hash != _content_hash(values):
+                        self._upsert(row_number, values, now)
+                        changed += 1
+                self._set_meta("last_reconcile", now)
+
+            for row_number, values in enumerate(appended, start=last + 1):
+                self._upsert(row_number, _pad(values), now)
+            self._set_meta("last_synced_row", last + len(appended))
+            self._conn.commit()
+
+        return {"appended": len(appended), "changed": changed, "reconciled": bool(reconcile)}
+
+    def pending(self) -> list[dict]:
+        """Tickets missing a sentiment or reply, keyed like get_all_records() plus RowNumber."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row_number, name, email, issue_type, message, sentiment, issue_label, auto_reply "
+                "FROM tickets WHERE (sentiment = '' OR auto_reply = '') AND message != '' "
+                "ORDER BY row_number"
+            ).fetchall()
+        return [{**dict(zip(COLUMNS, row[1:])), "RowNumber": row[0]} for row in rows]
+
+    def mark_processed(self, row_number, sentiment, issue_type, reply):
+        """Record our own sheet write locally so the next sync need not re-read the row."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT name, email, issue_type, message FROM tickets WHERE row_number = ?", (row_number,)
+            ).fetchone()
+            if row is None:
+                return
+            self._upsert(row_number, [*row, sentiment, issue_type, reply], time.time())
+            self._conn.commit()
+
+    def reset(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM tickets")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.commit()
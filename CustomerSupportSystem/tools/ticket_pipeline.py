@@ -0,0 +1,78 @@
+import time
+from tools.sheet_conector import update_ticket, append_processed_ticket
+from tools.classify_and_reply import classify_and_reply
+from tools.classify_ticket import classify_ticket
+from tools.fast_classifier import get_fast_classifier
+from tools.reply_cache import get_reply_cache
+from tools.gmail_sender import queue_email
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round(time.perf_counter() - start, 3)
+
+def analyze_ticket(message: str, name: str = None) -> tuple[dict, str, dict]:
+    """
+    Classify the ticket and draft the reply with as few LLM calls as possible.
+    A near-duplicate of an answered ticket reuses the cached reply, and then
+    only the labels are missing: a confident local prediction supplies them
+    with no LLM call at all, otherwise classify_ticket does. Without a cached
+    reply the LLM has to be called anyway, and the combined classify-and-reply
+    call returns the labels in the same round trip. LLM labels train the
+    local classifier.
+    Returns (classification, reply, timings).
+    """
+    classifier = get_fast_classifier()
+    cache = get_reply_cache()
+    cached_reply, cache_time = _timed(cache.lookup, message, name)
+    timings = {"reply_cache": cache_time, "local_classify": 0.0, "llm": 0.0}
+
+    if cached_reply is not None:
+        classification, classify_time = _timed(classifier.classify, message, classify_ticket)
+        timings["local_classify" if classification["source"] == "local" else "llm"] = classify_time
+        return classification, cached_reply, timings
+
+    result, timings["llm"] = _timed(classify_and_reply, message)
+    classification = {"sentiment": result["sentiment"], "issue_type": result["issue_type"], "source": "llm"}
+    classifier.learn(message, result["sentiment"], result["issue_type"])
+    cache.add(message, result["reply"], name)
+    return classification, result["reply"], timings
+
+def process_ticket(ticket: dict) -> dict:
+    """
+    Classify, reply, update the sheets and email the customer for one ticket
+    fetched from SupportTickets. Returns the outcome with per-stage timings.
+    """
+    start = time.perf_counter()
+    classification, reply, timings = analyze_ticket(ticket["Message"], ticket.get("Name"))
+    sentiment = classification["sentiment"]
+    issue_type = classification["issue_type"]
+
+    _, timings["update_sheet"] = _timed(
+        update_ticket,
+        row_number=ticket["RowNumber"],
+        sentiment=sentiment,
+        issue_type=issue_type,
+        reply=reply
+    )
+    _, timings["append_processed"] = _timed(append_processed_ticket, ticket, sentiment, issue_type, reply)
+
+    # Replies from all tickets in flight share the outbox's pooled SMTP connections
+    mail_future = queue_email(
+        to=ticket["Email"],
+        subject="Regarding Your Support Ticket",
+        body=reply
+    )
+    mail_result, timings["email"] = _timed(mail_future.result)
+    timings["total"] = round(time.perf_counter() - start, 3)
+
+    return {
+        "row_number": ticket["RowNumber"],
+        "email": ticket["Email"],
+        "sentiment": sentiment,
+        "issue_type": issue_type,
+        "classifier": classification["source"],
+        "reply": reply,
+        "mail_result": mail_result,
+        "timings": timings
+    }
@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from tools.sheet_conector import fetch_new_tickets, writer
+from tools.ticket_pipeline import process_ticket
+from tools.fast_classifier import get_fast_classifier
+from tools.reply_cache import get_reply_cache
+from tools.startup import warm_up
+
+TIMINGS_LOG = os.getenv("TICKET_TIMINGS_LOG", "ticket_timings.jsonl")
+
+def log_result(result: dict):
+    record = {
+        "processed_at": datetime.now().isoformat(timespec="seconds"),
+        "row_number": result.get("row_number"),
+        "email": result.get("email"),
+        "status": result.get("status", "success"),
+        "classifier": result.get("classifier"),
+        "timings": result.get("timings", {})
+    }
+    with open(TIMINGS_LOG, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def load_timings(limit=50) -> list[dict]:
+    if not os.path.exists(TIMINGS_LOG):
+        return []
+    with open(TIMINGS_LOG, encoding="utf-8") as f:
+        lines = f.readlines()[-limit:]
+    return [json.loads(line) for line in lines if line.strip()]
+
+def _run(ticket: dict) -> dict:
+    try:
+        result = process_ticket(ticket)
+    except Exception as e:
+        result = {"row_number": ticket.get("RowNumber"), "email": ticket.get("Email"), "status": "error", "error": str(e)}
+    log_result(result)
+    return result
+
+def run_worker(poll_interval=15, max_workers=4, once=False):
+    in_flight = {}
+    print(f"🔥 Warm-up: {warm_up()}")
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ticket") as executor:
+        while True:
+            # Forget finished tickets so a failed one can be retried on a later poll
+            for row_number in [r for r, f in in_flight.items() if f.done()]:
+                result = in_flight.pop(row_number).result()
+                print(f"🧾 Row {row_number}: {result.get('status', 'success')} {result.get('timings', result.get('error'))}")
+
+            # Write buffered results before re-reading so finished tickets are not picked up again
+            writer.flush()
+
+            try:
+                tickets = fetch_new_tickets()
+            except Exception as e:
+                print(f"❌ Failed to fetch tickets: {e}")
+                tickets = []
+
+            queued = 0
+            for ticket in tickets:
+                if ticket["RowNumber"] in in_flight:
+                    continue
+                in_flight[ticket["RowNumber"]] = executor.submit(_run, ticket)
+                queued += 1
+
+            if queued:
+                print(f"📥 Queued {queued} ticket(s), {len(in_flight)} in flight")
+                print(f"🧠 Local classifier: {get_fast_classifier().report()}")
+                print(f"♻️ Reply cache: {get_reply_cache().report()}")
+
+            if once:
+                break
+            time.sleep(poll_interval)
+
+    for row_number, future in in_flight.items():
+        result = future.result()
+        print(f"🧾 Row {row_number}: {result.get('status', 'success')} {result.get('timings', result.get('error'))}")
+    writer.flush()
+
+if __name__ == "__main__":
+    sys.stdout.reconfigure(encoding='utf-8')
+    parser = argparse.ArgumentParser(description="Background worker that resolves new support tickets.")
+    parser.add_argument("--interval", type=float, default=15, help="Seconds between polls of the SupportTickets sheet")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum tickets processed in parallel")
+    parser.add_argument("--once", action="store_true", help="Process the current backlog and exit")
+    args = parser.parse_args()
+
+    run_worker(poll_interval=args.interval, max_workers=args.workers, once=args.once)
@@ -0,0 +1,98 @@
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+from bs4 import BeautifulSoup
+from tools.pubmed_fetcher import iter_pubmed_articles
+from tools.eutils_stub import FIXTURE, ARTICLE_RE, PMID_RE
+
+# Compare the streaming lxml parser against the previous BeautifulSoup tree
+# parser on a large efetch response, synthesized by repeating the canned
+# fixture articles under fresh PMIDs.
+
+def parse_with_bs4(xml_text: str) -> list[dict]:
+    soup = BeautifulSoup(xml_text, "lxml")
+    articles_info = []
+    for article in soup.find_all("pubmedarticle"):
+        title_tag = article.find("articletitle")
+        abstract_tag = article.find("abstract")
+        date_tag = article.find("pubdate")
+        pmid = article.find("pmid").get_text()
+
+        authors = []
+        for author in article.find_all("author"):
+            last = author.find("lastname")
+            fore = author.find("forename")
+            if last and fore:
+                authors.append(f"{fore.get_text()} {last.get_text()}")
+            elif last:
+                authors.append(last.get_text())
+
+        pub_date = "No date"
+        if date_tag:
+            year = date_tag.find("year")
+            month = date_tag.find("month")
+            pub_date = f"{month.get_text()} {year.get_text()}" if year and month else year.get_text() if year else "No date"
+
+        articles_info.append({
+            "pmid": pmid,
+            "title": title_tag.get_text(strip=True) if title_tag else "No title",
+            "abstract": abstract_tag.get_text(separator=" ", strip=True) if abstract_tag else "No abstract available",
+            "authors": authors if authors else ["No authors listed"],
+            "publication_date": pub_date,
+            "article_url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+        })
+    return articles_info
+
+def build_fixture(path: str, count: int):
+    with open(FIXTURE, encoding="utf-8") as f:
+        templates = ARTICLE_RE.findall(f.read())
+    with open(path, "w", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" ?>\n<PubmedArticleSet>\n')
+        for i in range(count):
+            pmid = str(30000000 + i)
+            out.write(PMID_RE.sub(f'<PMID Version="1">{pmid}</PMID>', templates[i % len(templates)], count=1))
+            out.write("\n")
+        out.write("</PubmedArticleSet>\n")
+
+def measure(parse):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = parse()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PubMed efetch XML parsers.")
+    parser.add_argument("--articles", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "efetch.xml")
+        build_fixture(path, args.articles)
+        size_mb = os.path.getsize(path) / 1e6
+
+        def bs4_path():
+            with open(path, encoding="utf-8") as f:
+                return len(parse_with_bs4(f.read()))
+
+        def lxml_stream():
+            # Consume incrementally, the way a caller handling hundreds of results would
+            return sum(1 for _ in iter_pubmed_articles(path))
+
+        results = {"beautifulsoup tree": measure(bs4_path), "lxml iterparse": measure(lxml_stream)}
+
+        # Both parsers must agree before the numbers mean anything
+        with open(path, encoding="utf-8") as f:
+            same = parse_with_bs4(f.read()) == list(iter_pubmed_articles(path))
+
+    print(f"{args.articles} articles, {size_mb:.1f} MB of XML")
+    for name, (count, elapsed, peak) in results.items():
+        print(f"{name:<20} {elapsed:7.3f}s  peak {peak / 1e6:8.1f} MB  ({count} articles)")
+    print(f"outputs identical: {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import re
+import json
+import time
+import random
+import argparse
+from tools.symptom_extractor import SymptomExtractor, VOCAB_PATH
+
+# Compare the trie extractor against extending the old approach to the full
+# vocabulary: one big regex alternation of every phrase, longest first.
+# Notes are synthesized from filler sentences mixed with vocabulary phrases,
+# some of them negated.
+
+FILLER = [
+    "The patient is a {age} year old seen in clinic today",
+    "Vitals were recorded by the nursing staff on arrival",
+    "Past medical history was reviewed with the patient and family",
+    "Medications were reconciled and no changes were made",
+    "The patient lives at home and is independent with daily activities",
+    "Follow up has been arranged in two weeks with repeat bloods",
+]
+TEMPLATES = [
+    "Reports {a} and {b} for the past {n} days",
+    "Denies {a} or {b}",
+    "Complains of worsening {a} but no {b}",
+    "{a} has resolved, still has {b}",
+    "Negative for {a}, {b} and {c}",
+]
+
+def build_notes(vocabulary: dict, count: int, sentences: int, seed=7) -> list[str]:
+    rng = random.Random(seed)
+    phrases = [phrase for canonical, synonyms in vocabulary.items() for phrase in [canonical, *synonyms]]
+    notes = []
+    for _ in range(count):
+        parts = []
+        for _ in range(sentences):
+            if rng.random() < 0.5:
+                parts.append(rng.choice(FILLER).format(age=rng.randint(18, 90)))
+            else:
+                parts.append(rng.choice(TEMPLATES).format(a=rng.choice(phrases), b=rng.choice(phrases), c=rng.choice(phrases), n=rng.randint(1, 14)))
+        notes.append(". ".join(parts) + ".")
+    return notes
+
+def build_regex(vocabulary: dict):
+    lookup = {phrase.lower(): canonical for canonical, synonyms in vocabulary.items() for phrase in [canonical, *synonyms]}
+    pattern = "|".join(re.escape(phrase) for phrase in sorted(lookup, key=len, reverse=True))
+    return re.compile(rf"\b(?:{pattern})\b", re.IGNORECASE), lookup
+
+def run(extract, notes) -> tuple[float, int]:
+    start = time.perf_counter()
+    found = sum(len(extract(note)) for note in notes)
+    return time.perf_counter() - start, found
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark symptom extraction over long clinical notes.")
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--sentences", type=int, default=200, help="Sentences per note")
+    args = parser.parse_args()
+
+    with open(VOCAB_PATH, encoding="utf-8") as f:
+        vocabulary = json.load(f)
+    notes = build_notes(vocabulary, args.notes, args.sentences)
+    size_mb = sum(len(note) for note in notes) / 1e6
+
+    start = time.perf_counter()
+    extractor = SymptomExtractor(vocabulary)
+    trie_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    regex, lookup = build_regex(vocabulary)
+    regex_build = time.perf_counter() - start
+
+    def extract_regex(note):
+        return sorted({lookup[match.group().lower()] for match in regex.finditer(note)})
+
+    def extract_original(note):
+        return list(set(re.findall(r"\b(headache|fever|nausea|fatigue|pain)\b", note.lower())))
+
+    results = {
+        "original 5-word regex": (0.0, run(extract_original, notes)),
+        "phrase alternation": (regex_build, run(extract_regex, notes)),
+        "trie + negation": (trie_build, run(extractor.extract, notes)),
+    }
+
+    print(f"{extractor.symptoms} symptoms, {extractor.phrases} phrases; {args.notes} notes, {size_mb:.1f} MB of text")
+    for name, (build, (elapsed, found)) in results.items():
+        print(f"{name:<22} build {build * 1000:7.1f} ms  scan {elapsed:7.3f}s  {size_mb / elapsed:6.1f} MB/s  {found:6d} symptoms kept")
+    print("(the alternation regex has no negation handling, so it keeps denied symptoms too)")
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,41 @@
-from fastapi import FastAPI
+import os
+import json
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from tools.diagnosis_tools import get_diagnosis
-from tools.symptom_extractor import extract_symptoms
-from tools.pubmed_fetcher import fetch_pubmed_articles_with_metadata
-from tools.summarizer import summarize_text
+from tools.pipeline import run_diagnosis_pipeline, iter_batch_diagnoses
+from tools.diagnosis_cache import get_diagnosis_cache
+from tools.eutils_client import get_cache
+
+MAX_BATCH_NOTES = int(os.getenv("MAX_BATCH_NOTES", 500))
 
 app = FastAPI()
 
 class SymptomInput(BaseModel):
     description:str
 
+class BatchInput(BaseModel):
+    descriptions:list[str]
+
 @app.post("/diagnosis")
-def diagnose_patient(data:SymptomInput):
-    symptoms = extract_symptoms(data.description)
-    diagnosis = get_diagnosis(symptoms)
-    pwbmed_raw = fetch_pubmed_articles_with_metadata(" ".join(symptoms))
-    summary = summarize_text(pwbmed_raw[:3000])
-    
+async def diagnose_patient(data:SymptomInput):
+    return await run_diagnosis_pipeline(data.description)
+
+@app.post("/diagnosis/batch")
+async def diagnose_batch(data:BatchInput):
+    if len(data.descriptions) > MAX_BATCH_NOTES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_NOTES} notes per batch")
+
+    # One NDJSON line per note, in completion order; "index" maps back to the input
+    async def lines():
+        async for result in iter_batch_diagnoses(data.descriptions):
+            yield json.dumps(result, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/diagnosis/cache")
+def cache_stats():
     return {
-        "symptom":symptoms,
-        "diabnosis":diagnosis,
-        "pubmed_summary" :summary
+        "diagnosis": get_diagnosis_cache().report(),
+        "pubmed": get_cache().report()
     }
-    
\ No newline at end of file
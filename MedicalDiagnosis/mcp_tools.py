@@ -1,23 +1,21 @@
 from fastmcp import FastMCP
-from tools.diagnosis_tools import get_diagnosis
-from tools.symptom_extractor import extract_symptoms
-from tools.pubmed_fetcher import fetch_pubmed_articles_with_metadata
-from tools.summarizer import summarize_text
+from tools.pipeline import run_diagnosis_pipeline
+from tools.diagnosis_cache import get_diagnosis_cache
+from tools.eutils_client import get_cache
 
 mcp = FastMCP()
 
 @mcp.tool()
-def diagnose_patient(SymptomInput):
-    symptoms = extract_symptoms(SymptomInput)
-    diagnosis = get_diagnosis(symptoms)
-    pwbmed_raw = fetch_pubmed_articles_with_metadata(" ".join(symptoms))
-    summary = summarize_text(pwbmed_raw[:3000])
-    
+async def diagnose_patient(SymptomInput):
+    return await run_diagnosis_pipeline(SymptomInput)
+
+@mcp.tool()
+def cache_stats():
+    """Hit rates and sizes of the diagnosis and PubMed caches."""
     return {
-        "symptom":symptoms,
-        "diabnosis":diagnosis,
-        "pubmed_summary" :summary
+        "diagnosis": get_diagnosis_cache().report(),
+        "pubmed": get_cache().report()
     }
 
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    mcp.run()
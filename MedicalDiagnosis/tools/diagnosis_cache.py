@@ -0,0 +1,122 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+
+# On-disk cache of LLM diagnoses, keyed on the sorted canonical symptom set
+# plus the model id. Many free-text descriptions reduce to the same symptoms,
+# so the FastAPI app and the MCP server share one SQLite file (WAL mode) and
+# each benefits from the other's answers.
+#
+# Entries expire after DIAGNOSIS_CACHE_TTL seconds; beyond
+# DIAGNOSIS_CACHE_MAX entries the least recently used ones are evicted.
+# Hit/miss counters live in the same file, so the reported hit rate covers
+# every process using it.
+
+DB_PATH = os.getenv("DIAGNOSIS_CACHE_DB", "diagnosis_cache.db")
+TTL = float(os.getenv("DIAGNOSIS_CACHE_TTL", 7 * 24 * 3600))
+MAX_ENTRIES = int(os.getenv("DIAGNOSIS_CACHE_MAX", 5000))
+
+def diagnosis_key(symptoms: list[str], model: str) -> str:
+    raw = "\x1f".join([model, *sorted(set(symptoms))])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DiagnosisCache:
+    def __init__(self, path=DB_PATH, ttl=TTL, max_entries=MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS diagnoses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                symptoms TEXT NOT NULL,
+                diagnosis TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS diagnoses_last_used ON diagnoses (last_used);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        """)
+
+    def _count(self, name: str, n=1):
+        self._conn.execute(
+            "INSERT INTO counters VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            (name, n)
+        )
+
+    def get(self, symptoms: list[str], model: str):
+        key = diagnosis_key(symptoms, model)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT diagnosis, created_at FROM diagnoses WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] < self.ttl:
+                self._conn.execute("UPDATE diagnoses SET last_used = ? WHERE key = ?", (now, key))
+                self._count("hits")
+                return row[0]
+            if row:
+                self._conn.execute("DELETE FROM diagnoses WHERE key = ?", (key,))
+                self._count("expired")
+            self._count("misses")
+            return None
+
+    def put(self, symptoms: list[str], model: str, diagnosis: str):
+        key = diagnosis_key(symptoms, model)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO diagnoses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, ", ".join(sorted(set(symptoms))), diagnosis, now, now)
+                )
+                evicted = self._conn.execute("""
+                    DELETE FROM diagnoses WHERE key IN (
+                        SELECT key FROM diagnoses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,)).rowcount
+                if evicted:
+                    self._count("evictions", evicted)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM diagnoses")
+            self._conn.execute("DELETE FROM counters")
+
+    def report(self) -> dict:
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            size = self._conn.execute("SELECT COUNT(*) FROM diagnoses").fetchone()[0]
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+            "expired": counters.get("expired", 0),
+            "evictions": counters.get("evictions", 0)
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_diagnosis_cache() -> DiagnosisCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiagnosisCache()
+        return _cache
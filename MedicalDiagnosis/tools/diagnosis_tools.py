@@ -1,19 +1,46 @@
 import os
 from dotenv import load_dotenv
 load_dotenv()
-from groq import Groq
+from groq import Groq, AsyncGroq
+from tools.diagnosis_cache import get_diagnosis_cache
 
+MODEL = "llama-3.1-8b-instant"
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+async_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
 
-def get_diagnosis(symptoms: list[str]) -> str:
+def _diagnosis_messages(symptoms: list[str]) -> list[dict]:
     prompt = f"Patient has symptoms: {', '.join(symptoms)}. Suggest possible medical diagnoses.suggest me a possible cure fro the same"
+    return [
+        {"role": "system", "content": "You are a helpful medical assistant."},
+        {"role": "user", "content": prompt}
+    ]
+
+def get_diagnosis(symptoms: list[str]) -> str:
+    cache = get_diagnosis_cache()
+    cached = cache.get(symptoms, MODEL)
+    if cached is not None:
+        return cached
 
     response = client.chat.completions.create(
-        model="llama-3.1-8b-instant",  # or "gpt-3.5-turbo"
-        messages=[
-            {"role": "system", "content": "You are a helpful medical assistant."},
-            {"role": "user", "content": prompt}
-        ]
+        model=MODEL,  # or "gpt-3.5-turbo"
+        messages=_diagnosis_messages(sorted(set(symptoms)))
+    )
+
+    diagnosis = response.choices[0].message.content.strip()
+    cache.put(symptoms, MODEL, diagnosis)
+    return diagnosis
+
+async def get_diagnosis_async(symptoms: list[str]) -> str:
+    cache = get_diagnosis_cache()
+    cached = cache.get(symptoms, MODEL)
+    if cached is not None:
+        return cached
+
+    response = await async_client.chat.completions.create(
+        model=MODEL,
+        messages=_diagnosis_messages(sorted(set(symptoms)))
     )
 
-    return response.choices[0].message.content.strip()
+    diagnosis = response.choices[0].message.content.strip()
+    cache.put(symptoms, MODEL, diagnosis)
+    return diagnosis
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+import contextlib
+import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Pooled NCBI E-utilities client plus a local cache of its results.
+#
+# NCBI allows 3 requests/s per client (10/s with an API key), so every call
+# goes through a shared RateGovernor. Search results are cached by normalized
+# query for SEARCH_TTL seconds; parsed article records are cached by PMID
+# forever, since a published record does not change. Per-article LLM
+# summaries are kept alongside, keyed by PMID and model.
+#
+# The async calls share one httpx.AsyncClient per event loop while a
+# session_async() block is open on that loop; the last block to exit closes
+# it. A call made outside any block opens and closes its own client.
+#
+# EUTILS_BASE_URL can point at tools/eutils_stub.py to run offline.
+
+BASE_URL = os.getenv("EUTILS_BASE_URL", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils")
+API_KEY = os.getenv("NCBI_API_KEY")
+CACHE_DB = os.getenv("PUBMED_CACHE_DB", "pubmed_cache.db")
+SEARCH_TTL = float(os.getenv("PUBMED_SEARCH_TTL", 24 * 3600))
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+def normalize_query(query: str) -> str:
+    """
+    Cache key for a search. Only case and spacing are folded: PubMed's term
+    mapping matches phrases, so word order and repeats can change the result.
+    The query itself is always sent to esearch as given.
+    """
+    return " ".join(query.lower().split())
+
+
+class RateGovernor:
+    """Spaces calls at least 1/rate seconds apart across threads and tasks."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+            return slot - now
+
+    def wait(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def wait_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class EUtilsClient:
+    def __init__(self, base_url=BASE_URL, api_key=API_KEY, timeout=10, pool_size=10):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.governor = RateGovernor(10 if api_key else 3)
+        self.requests = 0
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._async_sessions = {}
+        self._async_lock = threading.Lock()
+
+    def _params(self, params: dict) -> dict:
+        if self.api_key:
+            return {**params, "api_key": self.api_key}
+        return params
+
+    @contextlib.asynccontextmanager
+    async def session_async(self):
+        """
+        Share one httpx.AsyncClient across the calls made on the running loop
+        inside the block:
+
+            client = get_client()
+            async with client.session_async():
+                ids = await client.esearch_async(query)
+        """
+        # httpx clients are tied to the event loop they were first used on,
+        # so each loop gets its own, counted by the blocks open on it
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            session = self._async_sessions.get(loop)
+            if session is None:
+                session = self._async_sessions[loop] = [httpx.AsyncClient(headers=HEADERS, timeout=self.timeout), 0]
+            session[1] += 1
+        try:
+            yield session[0]
+        finally:
+            with self._async_lock:
+                session[1] -= 1
+                last = session[1] == 0
+                if last:
+                    del self._async_sessions[loop]
+            if last:
+                await session[0].aclose()
+
+    async def _get_async(self, path: str, params: dict) -> httpx.Response:
+        await self.governor.wait_async()
+        self.requests += 1
+        async with self.session_async() as http:
+            response = await http.get(f"{self.base_url}/{path}", params=params)
+        response.raise_for_status()
+        return response
+
+    def _search_params(self, query, max_results):
+        return self._params({"db": "pubmed", "term": query, "retmax": max_results, "retmode": "json"})
+
+    def _fetch_params(self, pmids):
+        return self._params({"db": "pubmed", "id": ",".join(pmids), "retmode": "xml"})
+
+    def esearch(self, query: str, max_results=3) -> list[str]:
+        self.governor.wait()
+        self.requests += 1
+        response = self.session.get(f"{self.base_url}/esearch.fcgi", params=self._search_params(query, max_results), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["esearchresult"]["idlist"]
+
+    def efetch(self, pmids: list[str]) -> bytes:
+        self.governor.wait()
+        self.requests += 1
+        response = self.session.get(f"{self.base_url}/efetch.fcgi", params=self._fetch_params(pmids), timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    async def esearch_async(self, query: str, max_results=3) -> list[str]:
+        response = await self._get_async("esearch.fcgi", self._search_params(query, max_results))
+        return response.json()["esearchresult"]["idlist"]
+
+    async def efetch_async(self, pmids: list[str]) -> bytes:
+        response = await self._get_async("efetch.fcgi", self._fetch_params(pmids))
+        return response.content
+
+
+class PubMedCache:
+    def __init__(self, path=CACHE_DB, search_ttl=SEARCH_TTL):
+        self.search_ttl = search_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS searches (
+                query TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                pmids TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (query, max_results)
+            );
+            CREATE TABLE IF NOT EXISTS articles (
+                pmid TEXT PRIMARY KEY,
+                record TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS summaries (
+                pmid TEXT NOT NULL,
+                model TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                PRIMARY KEY (pmid, model)
+            );
+        """)
+        self.stats = {"search_hits": 0, "search_misses": 0, "article_hits": 0, "article_misses": 0}
+
+    def get_search(self, query: str, max_results: int):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pmids, fetched_at FROM searches WHERE query = ? AND max_results = ?",
+                (normalize_query(query), max_results)
+            ).fetchone()
+            if row and time.time() - row[1] < self.search_ttl:
+                self.stats["search_hits"] += 1
+                return json.loads(row[0])
+            self.stats["search_misses"] += 1
+            return None
+
+    def put_search(self, query: str, max_results: int, pmids: list[str]):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?)",
+                (normalize_query(query), max_results, json.dumps(pmids), time.time())
+            )
+
+    def get_articles(self, pmids: list[str]) -> dict:
+        if not pmids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT pmid, record FROM articles WHERE pmid IN ({','.join('?' * len(pmids))})", pmids
+            ).fetchall()
+            found = {pmid: json.loads(record) for pmid, record in rows}
+            self.stats["article_hits"] += len(found)
+            self.stats["article_misses"] += len(set(pmids) - found.keys())
+            return found
+
+    def put_articles(self, records: list[dict]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?)",
+                [(record["pmid"], json.dumps(record, ensure_ascii=False)) for record in records]
+            )
+
+    def get_summaries(self, pmids: list[str], model: str) -> dict:
+        if not pmids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT pmid, summary FROM summaries WHERE model = ? AND pmid IN ({','.join('?' * len(pmids))})", [model, *pmids]
+            ).fetchall()
+            return dict(rows)
+
+    def put_summaries(self, summaries: dict, model: str):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?)",
+                [(pmid, model, summary) for pmid, summary in summaries.items()]
+            )
+
+    def report(self) -> dict:
+        with self._lock:
+            searches = self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+            articles = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            summaries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        return {**self.stats, "cached_searches": searches, "cached_articles": articles, "cached_summaries": summaries}
+
+
+_client = None
+_cache = None
+_init_lock = threading.Lock()
+
+def get_client() -> EUtilsClient:
+    global _client
+    with _init_lock:
+        if _client is None:
+            _client = EUtilsClient()
+        return _client
+
+def get_cache() -> PubMedCache:
+    global _cache
+    with _init_lock:
+        if _cache is None:
+            _cache = PubMedCache()
+        return _cache
@@ -0,0 +1,83 @@
+import os
+import re
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Minimal local stand-in for NCBI E-utilities so tools.pubmed_fetcher can be
+# exercised offline (set EUTILS_BASE_URL=http://127.0.0.1:<port>).
+#
+# Articles come from a canned PubmedArticleSet XML file. esearch returns the
+# PMIDs of articles whose text contains every query term, efetch returns the
+# requested articles. `latency` delays every response to mimic NCBI.
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "pubmed_articles.xml")
+ARTICLE_RE = re.compile(r"<PubmedArticle>.*?</PubmedArticle>", re.S)
+PMID_RE = re.compile(r"<PMID[^>]*>(\d+)</PMID>")
+TAG_RE = re.compile(r"<[^>]+>")
+
+
+class _EUtilsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, body: str, content_type: str):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        endpoint = url.path.rsplit("/", 1)[-1]
+        with self.server.lock:
+            self.server.requests[endpoint] = self.server.requests.get(endpoint, 0) + 1
+
+        if endpoint == "esearch.fcgi":
+            terms = params.get("term", "").lower().split()
+            retmax = int(params.get("retmax", 20))
+            ids = [pmid for pmid, text in self.server.texts.items() if all(term in text for term in terms)]
+            self.respond(json.dumps({"esearchresult": {"count": str(len(ids)), "idlist": ids[:retmax]}}), "application/json")
+        elif endpoint == "efetch.fcgi":
+            ids = [pmid for pmid in params.get("id", "").split(",") if pmid in self.server.articles]
+            body = "\n".join(self.server.articles[pmid] for pmid in ids)
+            self.respond(f'<?xml version="1.0" ?>\n<PubmedArticleSet>\n{body}\n</PubmedArticleSet>\n', "text/xml")
+        else:
+            self.send_error(404)
+
+
+class EUtilsStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, fixture=FIXTURE, latency=0.0):
+        super().__init__((host, port), _EUtilsHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests = {}
+
+        with open(fixture, encoding="utf-8") as f:
+            xml = f.read()
+        self.articles = {PMID_RE.search(article).group(1): article for article in ARTICLE_RE.findall(xml)}
+        self.texts = {pmid: TAG_RE.sub(" ", article).lower() for pmid, article in self.articles.items()}
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+if __name__ == "__main__":
+    server = EUtilsStubServer(port=8090)
+    print(f"📚 E-utilities stub listening on {server.base_url} ({len(server.articles)} articles)")
+    server.serve_forever()
@@ -0,0 +1,97 @@
+import os
+import time
+import asyncio
+from tools.diagnosis_tools import get_diagnosis_async
+from tools.symptom_extractor import extract_symptoms
+from tools.pubmed_fetcher import fetch_pubmed_articles_async
+from tools.summarizer import summarize_articles_async
+from tools.eutils_client import get_client, normalize_query
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))
+
+async def _timed(coro):
+    start = time.perf_counter()
+    result = await coro
+    return result, round(time.perf_counter() - start, 3)
+
+async def _diagnose(symptoms: list[str], pubmed) -> dict:
+    """Diagnosis and PubMed retrieval (`pubmed` is an awaitable) concurrently, then the summary."""
+    timings = {}
+    (diagnosis, timings["diagnosis"]), (pwbmed_raw, timings["pubmed"]) = await asyncio.gather(
+        _timed(get_diagnosis_async(symptoms)),
+        _timed(pubmed)
+    )
+
+    summary, timings["summary"] = await _timed(summarize_articles_async(pwbmed_raw, symptoms))
+
+    return {
+        "symptom": symptoms,
+        "diabnosis": diagnosis,
+        "pubmed_summary": summary["synthesis"],
+        "pubmed_articles": summary["articles"],
+        "timings": timings
+    }
+
+async def run_diagnosis_pipeline(description: str) -> dict:
+    """
+    Extract symptoms, then run the diagnosis LLM call and the PubMed search
+    concurrently, then summarize each retrieved article and synthesize them.
+    Wall time is roughly max(diagnosis, pubmed) + summary.
+    """
+    start = time.perf_counter()
+    symptoms = extract_symptoms(description)
+    extract = round(time.perf_counter() - start, 3)
+
+    async with get_client().session_async():
+        result = await _diagnose(symptoms, fetch_pubmed_articles_async(" ".join(symptoms)))
+    result["timings"] = {"extract": extract, **result["timings"], "total": round(time.perf_counter() - start, 3)}
+    return result
+
+async def iter_batch_diagnoses(descriptions: list[str], max_concurrency=BATCH_CONCURRENCY):
+    """
+    Diagnose a batch of notes, yielding {"index", ...result} per note as soon as
+    its symptom set is done, then one {"done": True, ...} summary.
+    Notes with the same symptoms, in any order, share one diagnosis and one
+    PubMed search. The search sends the symptoms joined exactly as
+    run_diagnosis_pipeline does, so a note gets the same evidence either way.
+    """
+    start = time.perf_counter()
+    groups, symptom_lists = {}, {}
+    for index, description in enumerate(descriptions):
+        symptoms = extract_symptoms(description)
+        key = tuple(sorted(symptoms))
+        symptom_lists.setdefault(key, symptoms)
+        groups.setdefault(key, []).append(index)
+
+    pubmed = {}
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    def pubmed_task(symptoms):
+        query = " ".join(symptoms)
+        key = normalize_query(query)
+        if key not in pubmed:
+            pubmed[key] = asyncio.ensure_future(fetch_pubmed_articles_async(query))
+        return pubmed[key]
+
+    async def run(key):
+        symptoms = symptom_lists[key]
+        async with semaphore:
+            try:
+                return key, await _diagnose(symptoms, pubmed_task(symptoms))
+            except Exception as e:
+                return key, {"symptom": symptoms, "error": str(e)}
+
+    # Every PubMed request of the batch shares one connection pool
+    async with get_client().session_async():
+        for future in asyncio.as_completed([run(key) for key in groups]):
+            key, result = await future
+            for index in groups[key]:
+                yield {"index": index, **result, "shared_with": len(groups[key])}
+
+    yield {
+        "done": True,
+        "notes": len(descriptions),
+        "unique_symptom_sets": len(groups),
+        "pubmed_queries": len(pubmed),
+        "seconds": round(time.perf_counter() - start, 3)
+    }
@@ -1,101 +1,144 @@
-import requests
-from bs4 import BeautifulSoup
+import io
+from lxml import etree
+from tools.eutils_client import get_client, get_cache
 
-def fetch_pubmed_articles_with_metadata(query: str, max_results=3, use_mock_if_empty=True):
-    headers = {"User-Agent": "Mozilla/5.0"}
-
-    # Step 1: Search PubMed
-    search_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-    search_params = {
-        "db": "pubmed",
-        "term": query,
-        "retmax": max_results,
-        "retmode": "json"
+def _mock_articles():
+    return [{
+        "pmid": "12345678",
+        "title": "Simulated Study on Fever",
+        "abstract": "This is a simulated abstract on the treatment of fever in adults.",
+        "authors": ["John Doe", "Jane Smith"],
+        "publication_date": "March 2024",
+        "article_url": "https://pubmed.ncbi.nlm.nih.gov/12345678/",
+        "mock": True
+    }]
+
+def _text(element, separator=""):
+    if element is None:
+        return None
+    parts = (part.strip() for part in element.itertext())
+    return separator.join(part for part in parts if part)
+
+def _article_record(article) -> dict:
+    citation = article.find("MedlineCitation")
+    pmid = citation.findtext("PMID") if citation is not None else None
+
+    # Title
+    title = _text(article.find(".//ArticleTitle")) or "No title"
+
+    # Abstract
+    abstract = _text(article.find(".//Abstract"), separator=" ") or "No abstract available"
+
+    # Authors
+    authors = []
+    for author in article.iterfind(".//Author"):
+        last = author.findtext("LastName")
+        fore = author.findtext("ForeName")
+        if last and fore:
+            authors.append(f"{fore} {last}")
+        elif last:
+            authors.append(last)
+    authors = authors if authors else ["No authors listed"]
+
+    # Publication Date
+    pub_date = "No date"
+    date_tag = article.find(".//PubDate")
+    if date_tag is not None:
+        year = date_tag.findtext("Year")
+        month = date_tag.findtext("Month")
+        pub_date = f"{month} {year}" if year and month else year if year else "No date"
+
+    return {
+        "pmid": pmid,
+        "title": title,
+        "abstract": abstract,
+        "authors": authors,
+        "publication_date": pub_date,
+        # PubMed Article URL
+        "article_url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
     }
+
+def iter_pubmed_articles(source):
+    """
+    Stream article dicts out of an efetch PubmedArticleSet.
+    `source` is the XML as str/bytes, or a path / binary file object.
+    Each <PubmedArticle> is cleared once read, so memory stays flat.
+    """
+    if isinstance(source, str) and source.lstrip().startswith("<"):
+        source = source.encode("utf-8")
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    for _, article in etree.iterparse(source, events=("end",), tag="PubmedArticle", huge_tree=True):
+        yield _article_record(article)
+        article.clear()
+        while article.getprevious() is not None:
+            del article.getparent()[0]
+
+def parse_pubmed_articles(xml) -> list[dict]:
+    articles_info = list(iter_pubmed_articles(xml))
+    print("Articles found in XML:", len(articles_info))
+    return articles_info
+
+def _finish(articles_info, use_mock_if_empty):
+    if not articles_info and use_mock_if_empty:
+        print("No valid articles found, returning mock data.")
+        return _mock_articles()
+    return articles_info
+
+def _on_error(e, use_mock_if_empty):
+    print(f"Error during PubMed fetch: {e}")
+    if use_mock_if_empty:
+        return _mock_articles()
+    return [{"message": f"Error: {e}"}]
+
+def _ordered(id_list, records):
+    return [records[pmid] for pmid in id_list if pmid in records]
+
+def fetch_pubmed_articles_with_metadata(query: str, max_results=3, use_mock_if_empty=True):
+    client, cache = get_client(), get_cache()
+    try:
+        # Step 1: Search PubMed (cached by normalized query)
+        id_list = cache.get_search(query, max_results)
+        if id_list is None:
+            id_list = client.esearch(query, max_results)
+            cache.put_search(query, max_results, id_list)
+        print("Found PubMed IDs:", id_list)
+        if not id_list:
+            raise ValueError("No IDs found for this query.")
+
+        # Step 2: Fetch only the articles not already cached by PMID
+        records = cache.get_articles(id_list)
+        missing = [pmid for pmid in id_list if pmid not in records]
+        if missing:
+            fetched = parse_pubmed_articles(client.efetch(missing))
+            cache.put_articles(fetched)
+            records.update({record["pmid"]: record for record in fetched})
+        return _finish(_ordered(id_list, records), use_mock_if_empty)
+
+    except Exception as e:
+        return _on_error(e, use_mock_if_empty)
+
+async def fetch_pubmed_articles_async(query: str, max_results=3, use_mock_if_empty=True):
+    client, cache = get_client(), get_cache()
     try:
-        search_response = requests.get(search_url, params=search_params, headers=headers, timeout=10).json()
-        id_list = search_response["esearchresult"]["idlist"]
+        # Step 1: Search PubMed (cached by normalized query)
+        id_list = cache.get_search(query, max_results)
+        if id_list is None:
+            id_list = await client.esearch_async(query, max_results)
+            cache.put_search(query, max_results, id_list)
         print("Found PubMed IDs:", id_list)
         if not id_list:
             raise ValueError("No IDs found for this query.")
 
-        ids = ",".join(id_list)
-
-        # Step 2: Fetch article summaries
-        fetch_url = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
-        fetch_params = {
-            "db": "pubmed",
-            "id": ids,
-            "retmode": "xml"
-        }
-        fetch_response = requests.get(fetch_url, params=fetch_params, headers=headers, timeout=10)
-        soup = BeautifulSoup(fetch_response.text, "lxml")
-        articles_xml = soup.find_all("pubmedarticle")
-        print("Articles found in XML:", len(articles_xml))
-
-        articles_info = []
-        for article, pmid in zip(articles_xml, id_list):
-            title_tag = article.find("articletitle")
-            abstract_tag = article.find("abstract")
-            date_tag = article.find("pubdate")
-            author_tags = article.find_all("author")
-
-            # Title
-            title = title_tag.get_text(strip=True) if title_tag else "No title"
-
-            # Abstract
-            abstract = abstract_tag.get_text(separator=" ", strip=True) if abstract_tag else "No abstract available"
-
-            # Authors
-            authors = []
-            for author in author_tags:
-                last = author.find("lastname")
-                fore = author.find("forename")
-                if last and fore:
-                    authors.append(f"{fore.get_text()} {last.get_text()}")
-                elif last:
-                    authors.append(last.get_text())
-            authors = authors if authors else ["No authors listed"]
-
-            # Publication Date
-            pub_date = "No date"
-            if date_tag:
-                year = date_tag.find("year")
-                month = date_tag.find("month")
-                pub_date = f"{month.get_text()} {year.get_text()}" if year and month else year.get_text() if year else "No date"
-
-            # PubMed Article URL
-            url = f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
-
-            print(f"Article: {title}\n   - Authors: {authors}\n   - Date: {pub_date}\n   - URL: {url}\n")
-            articles_info.append({
-                "title": title,
-                "abstract": abstract,
-                "authors": authors,
-                "publication_date": pub_date,
-                "article_url": url
-            })
-
-        if not articles_info and use_mock_if_empty:
-            print("No valid articles found, returning mock data.")
-            return [{
-                "title": "Simulated Study on Fever",
-                "abstract": "This is a simulated abstract on the treatment of fever in adults.",
-                "authors": ["John Doe", "Jane Smith"],
-                "publication_date": "March 2024",
-                "article_url": "https://pubmed.ncbi.nlm.nih.gov/12345678/"
-            }]
-        return articles_info
+        # Step 2: Fetch only the articles not already cached by PMID
+        records = cache.get_articles(id_list)
+        missing = [pmid for pmid in id_list if pmid not in records]
+        if missing:
+            fetched = parse_pubmed_articles(await client.efetch_async(missing))
+            cache.put_articles(fetched)
+            records.update({record["pmid"]: record for record in fetched})
+        return _finish(_ordered(id_list, records), use_mock_if_empty)
 
     except Exception as e:
-        print(f"Error during PubMed fetch: {e}")
-        if use_mock_if_empty:
-            return [{
-                "title": "Simulated Study on Fever",
-                "abstract": "This is a simulated abstract on the treatment of fever in adults.",
-                "authors": ["John Doe", "Jane Smith"],
-                "publication_date": "March 2024",
-                "article_url": "https://pubmed.ncbi.nlm.nih.gov/12345678/"
-            }]
-        else:
-            return [{"message": f"Error: {e}"}]
+        return _on_error(e, use_mock_if_empty)
@@ -1,20 +1,124 @@
 # tools/summarizer.py
 import os
-from groq import Groq
+import asyncio
+from groq import Groq, AsyncGroq
 from dotenv import load_dotenv
+from tools.eutils_client import get_cache
 
 load_dotenv()
 client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+async_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
 
-def summarize_text(text: str) -> str:
+MODEL = "llama-3.1-8b-instant"
+# Budgets in tokens, estimated at ~4 characters per token
+ARTICLE_INPUT_TOKENS = int(os.getenv("SUMMARY_ARTICLE_INPUT_TOKENS", 700))
+ARTICLE_SUMMARY_TOKENS = int(os.getenv("SUMMARY_ARTICLE_OUTPUT_TOKENS", 150))
+SYNTHESIS_TOKENS = int(os.getenv("SUMMARY_SYNTHESIS_TOKENS", 300))
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", 4))
+
+def _summary_messages(text: str) -> list[dict]:
     prompt = f"Summarize the following medical abstract:\n\n{text}"
+    return [
+        {"role": "system", "content": "You are a medical research summarizer."},
+        {"role": "user", "content": prompt}
+    ]
 
+def summarize_text(text: str) -> str:
     response = client.chat.completions.create(
         model="llama-3.1-8b-instant",  # Or "gpt-3.5-turbo"
-        messages=[
-            {"role": "system", "content": "You are a medical research summarizer."},
-            {"role": "user", "content": prompt}
-        ]
+        messages=_summary_messages(text)
+    )
+
+    return response.choices[0].message.content.strip()
+
+async def summarize_text_async(text: str) -> str:
+    response = await async_client.chat.completions.create(
+        model=MODEL,
+        messages=_summary_messages(text)
     )
 
     return response.choices[0].message.content.strip()
+
+def _clip_tokens(text: str, budget: int) -> str:
+    limit = budget * 4
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + " ..."
+
+def _article_messages(article: dict) -> list[dict]:
+    abstract = _clip_tokens(article.get("abstract", ""), ARTICLE_INPUT_TOKENS)
+    prompt = f"Summarize the following medical abstract in 2-3 sentences, keeping the key finding.\n\nTitle: {article.get('title', '')}\n\n{abstract}"
+    return [
+        {"role": "system", "content": "You are a medical research summarizer."},
+        {"role": "user", "content": prompt}
+    ]
+
+def _synthesis_messages(summaries: list[dict], symptoms: list[str]) -> list[dict]:
+    findings = "\n".join(f"[{i}] {item['title']} ({item['publication_date']}): {item['summary']}" for i, item in enumerate(summaries, 1))
+    focus = f" for a patient with {', '.join(symptoms)}" if symptoms else ""
+    prompt = f"Write a short synthesis{focus} of what these studies say together, citing them as [n]:\n\n{findings}"
+    return [
+        {"role": "system", "content": "You are a medical research summarizer."},
+        {"role": "user", "content": prompt}
+    ]
+
+async def _complete(messages: list[dict], max_tokens: int) -> str:
+    response = await async_client.chat.completions.create(
+        model=MODEL,
+        messages=messages,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content.strip()
+
+async def summarize_articles_async(articles: list[dict], symptoms: list[str] = None) -> dict:
+    """
+    Map-reduce over PubMed records: summarize each abstract concurrently
+    (cached by PMID), then compose one cross-article synthesis. Mock
+    records are not evidence and are left out. An article whose summary
+    call fails falls back to its clipped abstract, which is not cached.
+    Returns {"synthesis": str, "articles": [{pmid, title, article_url, publication_date, summary}]}.
+    """
+    articles = [article for article in articles if article.get("pmid") and article.get("abstract") and not article.get("mock")]
+    if not articles:
+        return {"synthesis": "No PubMed articles found.", "articles": []}
+
+    cache = get_cache()
+    cached = cache.get_summaries([article["pmid"] for article in articles], MODEL)
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+    async def summarize(article):
+        if article["pmid"] in cached:
+            return cached[article["pmid"]]
+        async with semaphore:
+            return await _complete(_article_messages(article), ARTICLE_SUMMARY_TOKENS)
+
+    results = await asyncio.gather(*(summarize(article) for article in articles), return_exceptions=True)
+    summaries, fresh = [], {}
+    for article, result in zip(articles, results):
+        if isinstance(result, Exception):
+            print(f"Summary failed for PMID {article['pmid']}: {result}")
+            summaries.append(_clip_tokens(article["abstract"], ARTICLE_SUMMARY_TOKENS))
+            continue
+        summaries.append(result)
+        if article["pmid"] not in cached:
+            fresh[article["pmid"]] = result
+    cache.put_summaries(fresh, MODEL)
+
+    items = [{
+        "pmid": article["pmid"],
+        "title": article["title"],
+        "article_url": article["article_url"],
+        "publication_date": article["publication_date"],
+        "summary": summary
+    } for article, summary in zip(articles, summaries)]
+
+    if len(items) == 1:
+        synthesis = items[0]["summary"]
+    else:
+        try:
+            synthesis = await _complete(_synthesis_messages(items, symptoms), SYNTHESIS_TOKENS)
+        except Exception as e:
+            print(f"Synthesis failed: {e}")
+            synthesis = "\n\n".join(f"[{i}] {item['summary']}" for i, item in enumerate(items, 1))
+
+    return {"synthesis": synthesis, "articles": items}
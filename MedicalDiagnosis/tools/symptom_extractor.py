@@ -1,6 +1,156 @@
+import os
 import re
+import json
+import threading
+
+# Dictionary-based symptom extractor. The vocabulary (canonical symptom ->
+# synonyms, see tools/data/symptom_vocabulary.json) is compiled once into a
+# word-level trie. Text is tokenized and scanned left to right, taking the
+# longest phrase that starts at each word, so the cost is linear in the note
+# length (times the longest phrase, a handful of words) and independent of
+# the vocabulary size.
+#
+# Negation is NegEx-lite: a trigger such as "no", "denies" or "negative for"
+# negates the symptoms in the next NEGATION_WINDOW words, until a clause
+# terminator ("but", "."). Trailing triggers ("... has resolved") negate the
+# symptoms just before them.
+
+VOCAB_PATH = os.getenv("SYMPTOM_VOCAB", os.path.join(os.path.dirname(__file__), "data", "symptom_vocabulary.json"))
+NEGATION_WINDOW = 5
+POST_NEGATION_WINDOW = 3
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?|[.;:!?]", re.IGNORECASE)
+
+PRE_NEGATIONS = [
+    "no", "not", "without", "denies", "denied", "deny", "denying", "negative for", "free of",
+    "absence of", "no history of", "no signs of", "no evidence of", "no complaints of", "never",
+    "never had", "rules out", "ruled out", "does not have", "doesn't have", "did not have",
+    "didn't have", "do not have", "don't have", "neither", "nor", "resolution of",
+]
+POST_NEGATIONS = ["absent", "resolved", "has resolved", "have resolved", "ruled out", "denied", "is gone", "are gone", "went away", "unlikely"]
+PSEUDO_NEGATIONS = [
+    "no increase", "no change", "no improvement", "not improved", "not improving", "no relief",
+    "not only", "not necessarily", "not certain if", "without improvement", "gram negative",
+]
+TERMINATORS = {".", ";", ":", "!", "?", "but", "however", "although", "though", "yet", "except", "aside", "apart", "which", "who", "presents", "presented", "reports", "reported", "complains", "complained"}
+
+def _norm(word: str) -> str:
+    # Fold simple plurals so "headaches" and "headache" hit the same trie path
+    word = word.lower()
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def _words(phrase: str) -> list[str]:
+    return [_norm(match.group()) for match in TOKEN_RE.finditer(phrase)]
+
+def _insert(trie: dict, words: list[str], value):
+    node = trie
+    for word in words:
+        node = node.setdefault(word, {})
+    node[None] = value
+
+def _longest(trie: dict, words: list[str], start: int):
+    """Longest phrase in `trie` starting at words[start]: (end index, value) or None."""
+    node, best, i = trie, None, start
+    while i < len(words) and words[i] in node:
+        node = node[words[i]]
+        i += 1
+        if None in node:
+            best = (i, node[None])
+    return best
+
+def _build(phrases) -> dict:
+    trie = {}
+    for phrase in phrases:
+        _insert(trie, _words(phrase), phrase)
+    return trie
+
+
+class SymptomExtractor:
+    def __init__(self, vocabulary: dict):
+        self.trie = {}
+        self.phrases = 0
+        for canonical, synonyms in vocabulary.items():
+            for phrase in [canonical, *synonyms]:
+                _insert(self.trie, _words(phrase), canonical)
+                self.phrases += 1
+        self.symptoms = len(vocabulary)
+        self.pre = _build(PRE_NEGATIONS)
+        self.post = _build(POST_NEGATIONS)
+        self.pseudo = _build(PSEUDO_NEGATIONS)
+
+    @classmethod
+    def from_file(cls, path=VOCAB_PATH):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def mentions(self, text: str) -> list[dict]:
+        """
+        Every symptom mention in `text`, in order:
+        {"symptom": canonical, "text": matched text, "start", "end", "negated"}.
+        """
+        tokens = list(TOKEN_RE.finditer(text))
+        words = [_norm(token.group()) for token in tokens]
+        mentions, clause = [], []
+        scope, i = 0, 0
+
+        while i < len(words):
+            if words[i] in TERMINATORS:
+                scope, clause = 0, []
+                i += 1
+                continue
+
+            match = _longest(self.trie, words, i)
+            if match:
+                end, canonical = match
+                start_char, end_char = tokens[i].start(), tokens[end - 1].end()
+                mention = {"symptom": canonical, "text": text[start_char:end_char], "start": start_char, "end": end_char, "negated": scope > 0}
+                mentions.append(mention)
+                clause.append((end, mention))
+                scope = max(scope - 1, 0)
+                i = end
+                continue
+
+            pseudo = _longest(self.pseudo, words, i)
+            if pseudo:
+                i = pseudo[0]
+                continue
+
+            post = _longest(self.post, words, i)
+            if post:
+                for mention_end, mention in clause:
+                    if i - mention_end < POST_NEGATION_WINDOW:
+                        mention["negated"] = True
+
+            pre = _longest(self.pre, words, i)
+            if pre:
+                scope = NEGATION_WINDOW
+                i = pre[0]
+                continue
+
+            scope = max(scope - 1, 0)
+            i = post[0] if post else i + 1
+
+        return mentions
+
+    def extract(self, text: str) -> list[str]:
+        """Sorted canonical names of the symptoms present (not negated) in `text`."""
+        return sorted({mention["symptom"] for mention in self.mentions(text) if not mention["negated"]})
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+def get_extractor() -> SymptomExtractor:
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = SymptomExtractor.from_file()
+        return _extractor
 
 def extract_symptoms(text: str) -> list[str]:
-    # Very basic extraction
-    symptoms = re.findall(r"\b(headache|fever|nausea|fatigue|pain)\b", text.lower())
-    return list(set(symptoms))
\ No newline at end of file
+    return get_extractor().extract(text)
+
+def extract_symptom_mentions(text: str) -> list[dict]:
+    return get_extractor().mentions(text)
@@ -1,13 +1,17 @@
 import os
+import asyncio
 import yfinance as yf
 import pandas as pd
 import requests
 from dotenv import load_dotenv
+from price_store import get_price_store
+from indicators import compute_panel_indicators
+from euri_client import AsyncEuriClient, get_euri_client
 
 load_dotenv()
-EURI_API_KEY = os.getenv("EURI_API_KEY")
 ALPHA_VANTAGE_KEY = os.getenv("ALPHA_VANTAGE_KEY")
 GEMINI_FLASH_MODEL = "gemini-2.0-flash-001"
+SENTIMENT_CONCURRENCY = int(os.getenv("SENTIMENT_CONCURRENCY", 5))
 
 def get_from_alpha_vantage(ticker: str):
     url = f"https://www.alphavantage.co/query"
@@ -26,12 +30,10 @@ def get_from_alpha_vantage(ticker: str):
     return df.tail(120), {"shortName": ticker, "sector": "N/A", "marketCap": "N/A", "longBusinessSummary": "N/A"}
 
 def get_stock_data(ticker: str, period="6mo"):
-    try:
-        stock = yf.Ticker(ticker)
-        hist = stock.history(period=period)
-        info = stock.info
-    except Exception:
-        hist, info = get_from_alpha_vantage(ticker)
+    # Served from the local price store; only missing date ranges hit yfinance
+    # (or Alpha Vantage). The fetch counts ride along in hist.attrs.
+    hist, info, report = get_price_store().load(ticker, period)
+    hist.attrs["fetch_report"] = report
     return hist, info
 
 def calculate_indicators(df):
@@ -54,23 +56,61 @@ def calculate_indicators(df):
 
     return df
 
+def _sentiment_prompt(ticker: str) -> str:
+    return f"Search the latest 3 news about {ticker}. Summarize sentiment and cite headlines."
+
 def get_real_time_sentiments(ticker: str):
-    prompt = f"Search the latest 3 news about {ticker}. Summarize sentiment and cite headlines."
-    payload = {
-        "model": GEMINI_FLASH_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 700,
-        "temperature": 0.5
-    }
-    headers = {
-        "Authorization": f"Bearer {EURI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    response = requests.post("https://api.euron.one/api/v1/euri/alpha/chat/completions", headers=headers, json=payload)
-    return response.json()["choices"][0]["message"]["content"]
+    return get_euri_client().chat(_sentiment_prompt(ticker), model=GEMINI_FLASH_MODEL, max_tokens=700, temperature=0.5, label="sentiment")
+
+async def get_real_time_sentiments_async(ticker: str, client: AsyncEuriClient):
+    return await client.chat(_sentiment_prompt(ticker), model=GEMINI_FLASH_MODEL, max_tokens=700, temperature=0.5, label="sentiment")
+
+async def _gather_sentiments(tickers: list[str], max_concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(max_concurrency)
+    async with AsyncEuriClient(get_euri_client()) as client:
+        async def one(ticker):
+            async with semaphore:
+                try:
+                    return await get_real_time_sentiments_async(ticker, client)
+                except Exception as e:
+                    return f"⚠️ Sentiment unavailable: {e}"
+        results = await asyncio.gather(*(one(ticker) for ticker in tickers))
+    return dict(zip(tickers, results))
+
+def get_sentiments(tickers: list[str], max_concurrency=SENTIMENT_CONCURRENCY) -> dict:
+    """Sentiment for every ticker, with up to `max_concurrency` LLM calls in flight."""
+    return asyncio.run(_gather_sentiments(tickers, max_concurrency))
 
 def analyze_stock(ticker: str, period="6mo"):
     hist, info = get_stock_data(ticker, period)
     hist = calculate_indicators(hist)
     sentiment = get_real_time_sentiments(ticker)
     return hist, info, sentiment
+
+
+def analyze_portfolio(tickers: list[str], period="6mo", max_workers=None, with_sentiment=True):
+    """
+    Portfolio mode: history for all tickers (bulk download + bounded pool),
+    panel indicators, and concurrently fetched sentiment.
+    """
+    store = get_price_store()
+    loaded = store.load_many(tickers, period, **({"max_workers": max_workers} if max_workers else {}))
+
+    # Raw bars only; every indicator comes from the panel engine below
+    history = {ticker: bars for ticker, (bars, _, _) in loaded.items() if not bars.empty}
+    if not history:
+        raise ValueError("No price data could be loaded for any of the selected tickers")
+    close = pd.DataFrame({ticker: bars["Close"] for ticker, bars in history.items()}).sort_index()
+    high = pd.DataFrame({ticker: bars["High"] for ticker, bars in history.items() if "High" in bars})
+    low = pd.DataFrame({ticker: bars["Low"] for ticker, bars in history.items() if "Low" in bars})
+    have_range = not high.empty and list(high.columns) == list(close.columns)
+    panel = compute_panel_indicators(close, high if have_range else None, low if have_range else None)
+
+    return {
+        "history": history,
+        "info": {ticker: info for ticker, (_, info, _) in loaded.items()},
+        "close": close,
+        "panel": panel,
+        "sentiment": get_sentiments(list(history)) if with_sentiment else {},
+        "fetch_reports": {ticker: report for ticker, (_, _, report) in loaded.items()}
+    }
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# Vectorized backtest of the MA-crossover + RSI signals over a whole
+# parameter grid at once. The rule, for every (fast, slow, rsi_max)
+# combination:
+#
+#   long while MA(fast) > MA(slow) and RSI < rsi_max, flat otherwise
+#
+# The position is taken on the bar after the signal, so no combination
+# trades on information it could not have had. Each position change costs
+# `cost` (a fraction of the price).
+#
+# Every moving average comes from one cumulative sum of the closes, and the
+# signals, returns, equity curves and drawdowns of all combinations are
+# (bars x combinations) arrays. Nothing loops over bars or combinations in
+# Python. RSI is the RSI column of calculate_indicators().
+
+TRADING_DAYS = 252
+
+def moving_averages(close: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """(bars x windows) simple moving averages, NaN until each window is full."""
+    cs = np.concatenate([[0.0], np.cumsum(close)])
+    end = np.arange(1, len(close) + 1)[:, None]
+    start = end - windows[None, :]
+    sums = cs[end] - cs[np.maximum(start, 0)]
+    return np.where(start >= 0, sums / windows[None, :], np.nan)
+
+def parameter_grid(fast_windows, slow_windows, rsi_thresholds) -> pd.DataFrame:
+    """Every (fast, slow, rsi_max) combination with fast < slow."""
+    fast, slow, rsi_max = (a.ravel() for a in np.meshgrid(fast_windows, slow_windows, rsi_thresholds, indexing="ij"))
+    keep = fast < slow
+    return pd.DataFrame({"fast": fast[keep], "slow": slow[keep], "rsi_max": rsi_max[keep]})
+
+def run_grid(df: pd.DataFrame, grid: pd.DataFrame, cost=0.001, periods_per_year=TRADING_DAYS) -> pd.DataFrame:
+    """
+    Backtest every row of `grid` on a calculate_indicators() frame.
+    Returns the grid with total and annualized return, max drawdown, Sharpe
+    ratio, trade count and time in the market, sorted by Sharpe.
+    """
+    data = df[["Close", "RSI"]].dropna(subset=["Close"])
+    close = data["Close"].to_numpy(dtype=float)
+    rsi = data["RSI"].to_numpy(dtype=float)
+    if len(close) < 2:
+        raise ValueError("Need at least two bars to backtest")
+
+    windows, inverse = np.unique(np.concatenate([grid["fast"], grid["slow"]]), return_inverse=True)
+    ma = moving_averages(close, windows)
+    fast_ma = ma[:, inverse[:len(grid)]]
+    slow_ma = ma[:, inverse[len(grid):]]
+
+    # NaN comparisons are False, so nothing is held before the indicators exist
+    signal = (fast_ma > slow_ma) & (rsi[:, None] < grid["rsi_max"].to_numpy()[None, :])
+    position = np.zeros(signal.shape)
+    position[1:] = signal[:-1]
+
+    bar_returns = np.zeros(len(close))
+    bar_returns[1:] = close[1:] / close[:-1] - 1
+    turnover = np.abs(np.diff(position, axis=0, prepend=0.0))
+    returns = position * bar_returns[:, None] - cost * turnover
+
+    equity = np.cumprod(1 + returns, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+    total = equity[-1] - 1
+    years = (len(close) - 1) / periods_per_year
+    std = returns[1:].std(axis=0, ddof=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 0, returns[1:].mean(axis=0) / std * np.sqrt(periods_per_year), np.nan)
+        annual = np.where(equity[-1] > 0, equity[-1] ** (1 / years) - 1, -1.0)
+
+    result = grid.reset_index(drop=True).assign(
+        total_return=total,
+        annual_return=annual,
+        max_drawdown=drawdown.min(axis=0),
+        sharpe=sharpe,
+        trades=(turnover > 0).sum(axis=0),
+        exposure=position.mean(axis=0)
+    )
+    return result.sort_values("sharpe", ascending=False, na_position="last").reset_index(drop=True)
+
+def backtest_grid(df: pd.DataFrame, fast_windows=(3, 5, 8, 10, 13, 15, 20, 25, 30, 40),
+                  slow_windows=(50, 75, 100, 120, 150, 175, 200, 225, 250, 300),
+                  rsi_thresholds=(55, 60, 65, 70, 75, 80, 85, 90, 95, 101), cost=0.001) -> pd.DataFrame:
+    """run_grid() over every fast/slow/RSI combination (1,000 with the defaults; rsi_max=101 disables the filter)."""
+    return run_grid(df, parameter_grid(fast_windows, slow_windows, rsi_thresholds), cost=cost)
+
+def buy_and_hold(df: pd.DataFrame, periods_per_year=TRADING_DAYS) -> dict:
+    """The same statistics for simply holding the stock, as a baseline."""
+    close = df["Close"].dropna().to_numpy(dtype=float)
+    returns = close[1:] / close[:-1] - 1
+    equity = close / close[0]
+    years = (len(close) - 1) / periods_per_year
+    return {
+        "total_return": equity[-1] - 1,
+        "annual_return": equity[-1] ** (1 / years) - 1,
+        "max_drawdown": (equity / np.maximum.accumulate(equity) - 1).min(),
+        "sharpe": returns.mean() / returns.std(ddof=1) * np.sqrt(periods_per_year)
+    }
@@ -0,0 +1,208 @@
+import os
+import time
+import asyncio
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+load_dotenv()
+
+# One client for every EURI chat-completions call in this project. Requests
+# share a keep-alive connection pool, carry a timeout, and are retried with
+# jittered exponential backoff on 429, 5xx and connection errors (honouring
+# Retry-After). Each call's latency, retries and token usage are counted per
+# label, so report() shows where time and tokens go.
+#
+# AsyncEuriClient is the asyncio variant (httpx, imported on first use). It
+# shares the parent client's settings and counters; open one per event loop.
+
+EURI_API_URL = os.getenv("EURI_API_URL", "https://api.euron.one/api/v1/euri/alpha/chat/completions")
+EURI_API_KEY = os.getenv("EURI_API_KEY")
+TIMEOUT = float(os.getenv("EURI_TIMEOUT", 60))
+MAX_RETRIES = int(os.getenv("EURI_MAX_RETRIES", 3))
+POOL_SIZE = int(os.getenv("EURI_POOL_SIZE", 16))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class EuriError(RuntimeError):
+    def __init__(self, message: str, status_code: int = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def backoff_delay(attempt: int, retry_after=None) -> float:
+    """Seconds to wait before retry `attempt` (0-based): Retry-After if given, else full jitter."""
+    try:
+        if retry_after is not None:
+            return min(float(retry_after), BACKOFF_CAP)
+    except ValueError:
+        pass
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+def message_content(result: dict) -> str:
+    try:
+        return result["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        raise EuriError(f"Unexpected response: {str(result)[:200]}")
+
+def _payload(prompt: str, model: str, max_tokens: int, temperature: float, **extra) -> dict:
+    return {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        **extra
+    }
+
+
+class EuriClient:
+    def __init__(self, api_key=EURI_API_KEY, url=EURI_API_URL, timeout=TIMEOUT, max_retries=MAX_RETRIES, pool_size=POOL_SIZE):
+        self.url = url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.pool_size = pool_size
+        self.headers = {"Content-Type": "application/json", "Authorization": f"Bearer {api_key}"}
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_size))
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_size))
+        self._usage = {}
+        self._lock = threading.Lock()
+
+    def _record(self, label: str, seconds: float, retries: int, result: dict = None, error=False):
+        usage = (result or {}).get("usage") or {}
+        with self._lock:
+            entry = self._usage.setdefault(label, {
+                "calls": 0, "errors": 0, "retries": 0, "seconds": 0.0,
+                "max_seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0
+            })
+            entry["calls"] += 1
+            entry["errors"] += int(error)
+            entry["retries"] += retries
+            entry["seconds"] += seconds
+            entry["max_seconds"] = max(entry["max_seconds"], seconds)
+            entry["prompt_tokens"] += usage.get("prompt_tokens") or 0
+            entry["completion_tokens"] += usage.get("completion_tokens") or 0
+
+    def _should_retry(self, attempt: int, status: int = None) -> bool:
+        return attempt < self.max_retries and (status is None or status in RETRY_STATUSES)
+
+    def complete(self, payload: dict, label="chat") -> dict:
+        """POST one chat-completions payload; returns the decoded response."""
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(self.url, headers=self.headers, json=payload, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not self._should_retry(attempt):
+                    self._record(label, time.perf_counter() - start, attempt, error=True)
+                    raise EuriError(f"EURI request failed: {e}")
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code >= 400:
+                if self._should_retry(attempt, response.status_code):
+                    time.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+                    attempt += 1
+                    continue
+                self._record(label, time.perf_counter() - start, attempt, error=True)
+                raise EuriError(f"EURI returned {response.status_code}: {response.text[:200]}", response.status_code)
+
+            try:
+                result = response.json()
+            except ValueError:
+                self._record(label, time.perf_counter() - start, attempt, error=True)
+                raise EuriError(f"EURI returned non-JSON body: {response.text[:200]}", response.status_code)
+            self._record(label, time.perf_counter() - start, attempt, result)
+            return result
+
+    def chat(self, prompt: str, model="gpt-4.1-nano", max_tokens=500, temperature=0.5, label="chat", **extra) -> str:
+        """Single-message chat completion; returns the reply text."""
+        return message_content(self.complete(_payload(prompt, model, max_tokens, temperature, **extra), label))
+
+    def report(self) -> dict:
+        with self._lock:
+            usage = {label: dict(entry) for label, entry in self._usage.items()}
+        for entry in usage.values():
+            entry["avg_seconds"] = round(entry["seconds"] / entry["calls"], 3)
+            entry["seconds"] = round(entry["seconds"], 3)
+            entry["max_seconds"] = round(entry["max_seconds"], 3)
+        return usage
+
+
+class AsyncEuriClient:
+    """
+    asyncio counterpart of EuriClient.complete()/chat(), bound to the event
+    loop it is used in:
+
+        async with AsyncEuriClient(get_euri_client()) as client:
+            text = await client.chat(prompt)
+    """
+
+    def __init__(self, parent: EuriClient):
+        import httpx
+        self.parent = parent
+        self._httpx = httpx
+        self.http = httpx.AsyncClient(
+            timeout=parent.timeout,
+            headers=parent.headers,
+            limits=httpx.Limits(max_connections=parent.pool_size, max_keepalive_connections=parent.pool_size)
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def complete(self, payload: dict, label="chat") -> dict:
+        parent = self.parent
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = await self.http.post(parent.url, json=payload)
+            except self._httpx.TransportError as e:
+                if not parent._should_retry(attempt):
+                    parent._record(label, time.perf_counter() - start, attempt, error=True)
+                    raise EuriError(f"EURI request failed: {e}")
+                await asyncio.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code >= 400:
+                if parent._should_retry(attempt, response.status_code):
+                    await asyncio.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+                    attempt += 1
+                    continue
+                parent._record(label, time.perf_counter() - start, attempt, error=True)
+                raise EuriError(f"EURI returned {response.status_code}: {response.text[:200]}", response.status_code)
+
+            try:
+                result = response.json()
+            except ValueError:
+                parent._record(label, time.perf_counter() - start, attempt, error=True)
+                raise EuriError(f"EURI returned non-JSON body: {response.text[:200]}", response.status_code)
+            parent._record(label, time.perf_counter() - start, attempt, result)
+            return result
+
+    async def chat(self, prompt: str, model="gpt-4.1-nano", max_tokens=500, temperature=0.5, label="chat", **extra) -> str:
+        return message_content(await self.complete(_payload(prompt, model, max_tokens, temperature, **extra), label))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_euri_client() -> EuriClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = EuriClient()
+        return _client
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Indicator engine for a whole panel of tickers at once. Inputs are wide
+# frames (dates x tickers); every indicator is computed for all columns in
+# one pass over a 2-D array instead of one DataFrame per ticker.
+#
+# Rolling windows use cumulative sums, so their cost does not depend on the
+# window length. Recursive filters (EMA, Wilder smoothing) run as a single
+# pandas ewm over the whole panel. A ticker's history may start later
+# than the panel's (NaN before its first price). Gaps inside a series hold
+# the previous smoothed value.
+#
+# Values are computed in float64; pass dtype=np.float32 to halve the memory
+# the results take.
+
+def _rolling_sums(x: np.ndarray, window: int):
+    """Windowed sum of x and count of non-NaN values, aligned to the window end."""
+    valid = ~np.isnan(x)
+    cs = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    cnt = np.cumsum(valid, axis=0)
+    total, count = cs.copy(), cnt.copy()
+    total[window:] -= cs[:-window]
+    count[window:] -= cnt[:-window]
+    return total, count
+
+def rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    total, count = _rolling_sums(x, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count == window, total / window, np.nan)
+
+def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    # Sample std (ddof=1), matching pandas. Centering each column first keeps
+    # the sum-of-squares trick accurate for large prices.
+    with np.errstate(invalid="ignore"):
+        centered = x - np.nanmean(x, axis=0)
+    total, count = _rolling_sums(centered, window)
+    total_sq, _ = _rolling_sums(centered * centered, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var = (total_sq - total * total / window) / (window - 1)
+    return np.where(count == window, np.sqrt(np.maximum(var, 0.0)), np.nan)
+
+def ema(x: np.ndarray, span: int = None, alpha: float = None) -> np.ndarray:
+    """Exponential moving average, as pandas ewm(adjust=False) seeded at each column's first value."""
+    return pd.DataFrame(x).ewm(span=span, alpha=alpha, adjust=False, ignore_na=True).mean().to_numpy()
+
+def wilder(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder smoothing: the first value is the simple mean of the first `period`
+    observations, then avg = (avg * (period - 1) + x) / period.
+    """
+    # Replace each column's first `period` values by their mean at the last
+    # of them; from there the recursion is an EMA with alpha = 1 / period.
+    valid = ~np.isnan(x)
+    seen = np.cumsum(valid, axis=0)
+    seed_sum = np.cumsum(np.where(valid, x, 0.0), axis=0)
+    seeded = np.where(valid & (seen > period), x, np.nan)
+    seed_at = valid & (seen == period)
+    seeded[seed_at] = seed_sum[seed_at] / period
+    return ema(seeded, alpha=1.0 / period)
+
+def wilder_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    delta = np.full(close.shape, np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    avg_gain = wilder(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), period)
+    avg_loss = wilder(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return np.where((avg_loss == 0) & (avg_gain > 0), 100.0, rsi)
+
+def true_range(close: np.ndarray, high: np.ndarray = None, low: np.ndarray = None) -> np.ndarray:
+    prev_close = np.full(close.shape, np.nan)
+    prev_close[1:] = close[:-1]
+    if high is None or low is None:
+        # Close-only panels: fall back to the close-to-close move
+        return np.abs(close - prev_close)
+    # fmax skips the NaN previous close on each ticker's first day
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+def compute_panel_indicators(close: pd.DataFrame, high: pd.DataFrame = None, low: pd.DataFrame = None,
+                             dtype=np.float64, ma_windows=(20, 50), rsi_period=14,
+                             bb_window=20, bb_std=2.0, atr_period=14) -> dict:
+    """
+    All indicators for every ticker in `close` (dates x tickers).
+    Returns {name: DataFrame} with names MA20, MA50, RSI, MACD, Signal,
+    BB_Upper, BB_Mid, BB_Lower and ATR, each shaped like `close`.
+    """
+    # Column-major so the per-ticker time series are contiguous for cumsum/ewm
+    x = np.asfortranarray(close.to_numpy(dtype=np.float64))
+    hi = high.reindex_like(close).to_numpy(dtype=np.float64) if high is not None else None
+    lo = low.reindex_like(close).to_numpy(dtype=np.float64) if low is not None else None
+
+    results = {f"MA{window}": rolling_mean(x, window) for window in ma_windows}
+    results["RSI"] = wilder_rsi(x, rsi_period)
+
+    macd = ema(x, span=12) - ema(x, span=26)
+    results["MACD"] = macd
+    results["Signal"] = ema(macd, span=9)
+
+    mid = rolling_mean(x, bb_window)
+    band = bb_std * rolling_std(x, bb_window)
+    results["BB_Upper"] = mid + band
+    results["BB_Mid"] = mid
+    results["BB_Lower"] = mid - band
+
+    results["ATR"] = wilder(true_range(x, hi, lo), atr_period)
+
+    return {name: pd.DataFrame(values.astype(dtype, copy=False), index=close.index, columns=close.columns)
+            for name, values in results.items()}
+
+def ticker_frame(panel: dict, ticker: str, close: pd.DataFrame = None) -> pd.DataFrame:
+    """One ticker's indicators as columns, the layout calculate_indicators() produces."""
+    frame = pd.DataFrame({name: values[ticker] for name, values in panel.items()})
+    if close is not None:
+        frame.insert(0, "Close", close[ticker])
+    return frame
@@ -0,0 +1,113 @@
+import math
+from collections import deque
+import numpy as np
+import pandas as pd
+
+# Incremental versions of the indicators in analysis.calculate_indicators(),
+# for intraday monitoring. Each new bar costs O(1): the moving averages and
+# RSI keep a fixed window of values with a running sum, and the EWMs behind
+# MACD keep a single value. IndicatorState.from_frame() seeds the state from
+# a calculate_indicators() result, so later updates continue exactly where
+# the batch computation stopped.
+
+class RollingMean:
+    """Simple moving average over the last `window` values (NaN until full)."""
+
+    def __init__(self, window: int, values=()):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+        self.total = math.fsum(self.values)
+        self._updates = 0
+
+    def update(self, x: float) -> float:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+        # Re-sum once per window so floating point drift cannot build up
+        self._updates += 1
+        if self._updates >= self.window:
+            self.total = math.fsum(self.values)
+            self._updates = 0
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.total / self.window if len(self.values) == self.window else np.nan
+
+
+class EWM:
+    """pandas ewm(span=span, adjust=False).mean(), one value at a time."""
+
+    def __init__(self, span: int, value: float = np.nan):
+        self.alpha = 2.0 / (span + 1)
+        self.value = value
+
+    def update(self, x: float) -> float:
+        if np.isnan(self.value):
+            self.value = x
+        else:
+            self.value = (1 - self.alpha) * self.value + self.alpha * x
+        return self.value
+
+
+class IndicatorState:
+    """MA20, MA50, RSI (14-bar SMA of gains/losses), MACD and Signal, updated per bar."""
+
+    def __init__(self):
+        self.ma20 = RollingMean(20)
+        self.ma50 = RollingMean(50)
+        self.gain = RollingMean(14)
+        self.loss = RollingMean(14)
+        self.ema12 = EWM(12)
+        self.ema26 = EWM(26)
+        self.signal = EWM(9)
+        self.last_close = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        """Seed from calculate_indicators() output (needs Close, MACD and Signal)."""
+        state = cls()
+        close = df["Close"].astype(float)
+        if close.empty:
+            return state
+
+        # Same gain/loss series as calculate_indicators(); the first bar's
+        # NaN delta counts as a zero gain and zero loss there too.
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0)
+        loss = -delta.where(delta < 0, 0)
+
+        state.ma20 = RollingMean(20, close.tail(20).tolist())
+        state.ma50 = RollingMean(50, close.tail(50).tolist())
+        state.gain = RollingMean(14, gain.tail(14).tolist())
+        state.loss = RollingMean(14, loss.tail(14).tolist())
+        state.ema12 = EWM(12, close.ewm(span=12, adjust=False).mean().iloc[-1])
+        state.ema26 = EWM(26, close.ewm(span=26, adjust=False).mean().iloc[-1])
+        state.signal = EWM(9, df["Signal"].iloc[-1])
+        state.last_close = close.iloc[-1]
+        return state
+
+    def update(self, close: float) -> dict:
+        close = float(close)
+        delta = close - self.last_close if self.last_close is not None else 0.0
+        self.last_close = close
+
+        avg_gain = self.gain.update(max(delta, 0.0))
+        avg_loss = self.loss.update(max(-delta, 0.0))
+        if np.isnan(avg_gain) or np.isnan(avg_loss) or (avg_gain == 0 and avg_loss == 0):
+            rsi = np.nan
+        elif avg_loss == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+        macd = self.ema12.update(close) - self.ema26.update(close)
+        return {
+            "Close": close,
+            "MA20": self.ma20.update(close),
+            "MA50": self.ma50.update(close),
+            "RSI": rsi,
+            "MACD": macd,
+            "Signal": self.signal.update(macd)
+        }
@@ -1,12 +1,6 @@
-import os
-import requests
-from dotenv import load_dotenv
 from fpdf import FPDF
 import unicodedata
-
-load_dotenv()
-
-EURI_API_KEY = os.getenv("EURI_API_KEY")
+from euri_client import get_euri_client
 
 
 def clean_text_for_pdf(text: str):
@@ -28,25 +22,7 @@ def generate_swot_report(info, sentiment):
     Threats:
     """
 
-    payload = {
-        "model": "gpt-4.1-nano",
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 700,
-        "temperature": 0.7
-    }
-
-    headers = {
-        "Authorization": f"Bearer {EURI_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    response = requests.post(
-        "https://api.euron.one/api/v1/euri/alpha/chat/completions",
-        headers=headers,
-        json=payload
-    )
-
-    return response.json()["choices"][0]["message"]["content"]
+    return get_euri_client().chat(prompt, model="gpt-4.1-nano", max_tokens=700, temperature=0.7, label="swot")
 
 def save_swot_pdf(swot_text: str, filename="swot_report.pdf"):
     pdf = FPDF()
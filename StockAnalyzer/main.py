@@ -1,7 +1,6 @@
 import streamlit as st
-from analysis import analyze_stock
-from llm_report import generate_swot_report, save_swot_pdf
-from voiceover import generate_voiceover
+from pipeline import run_analysis
+from portfolio_view import render_portfolio
 from matplotlib import pyplot as plt
 
 st.set_page_config(page_title="📊 Stock Analyzer & Reporter", layout="wide")
@@ -44,6 +43,11 @@ stock_options = {
     "Hindustan Unilever": "HINDUNILVR.NS"
 }
 
+mode = st.radio("🧭 Mode", ["Single stock", "Portfolio"], horizontal=True)
+if mode == "Portfolio":
+    render_portfolio(stock_options)
+    st.stop()
+
 selected_company = st.selectbox("📌 Select a Company", options=list(stock_options.keys()))
 ticker = stock_options[selected_company]
 
@@ -54,10 +58,27 @@ period = st.radio("📅 Select Time Period", ["1mo", "3mo", "6mo", "1y", "2y"],
 # -------------------------------
 if st.button("🚀 Run Full Analysis"):
     with st.spinner("⏳ Fetching data and running analysis..."):
-        hist, info, sentiment = analyze_stock(ticker, period)
-        swot = generate_swot_report(info, sentiment)
-        pdf_file = save_swot_pdf(swot)
-        audio_file = generate_voiceover(swot)
+        result = run_analysis(ticker, period)
+    hist, sentiment, swot = result["hist"], result["sentiment"], result["swot"]
+    pdf_file, audio_file = result["pdf_file"], result["audio_file"]
+
+    timings, cached = result["timings"], result["cached"]
+    st.caption(
+        f"⏱️ {timings['total']:.2f}s total · "
+        + " · ".join(f"{stage} {timings[stage]:.2f}s" + (" (cached)" if cached[stage] else "")
+                     for stage in ["prices", "sentiment", "swot", "pdf", "voice"])
+    )
+    if cached["prices"]:
+        st.caption("🗄️ Prices and indicators reused from today's analysis")
+    else:
+        fetch_report = hist.attrs.get("fetch_report", {})
+        st.caption(
+            f"🗄️ {fetch_report.get('bars', len(hist))} bars from the local price store · "
+            f"{fetch_report.get('history_fetches', 0)} history fetches ({fetch_report.get('bars_fetched', 0)} new bars) · "
+            f"{fetch_report.get('info_fetches', 0)} info fetches"
+            + (f" · ⚠️ {fetch_report['failed_fetches']} failed fetches" if fetch_report.get("failed_fetches") else "")
+            + (" · offline fixtures" if fetch_report.get("offline") else "")
+        )
 
     # -------------------------------------
     # TABS Layout
@@ -94,7 +115,7 @@ if st.button("🚀 Run Full Analysis"):
     with tab3:
         st.subheader("🧠 AI SWOT Analysis (EURI GPT-4.1 Nano)")
         st.code(swot, language='markdown')
-        st.download_button("📥 Download SWOT PDF", data=open(pdf_file, "rb"), file_name=pdf_file)
+        st.download_button("📥 Download SWOT PDF", data=open(pdf_file, "rb"), file_name=f"{ticker}_swot_report.pdf")
 
     #tab4-voice
     with tab4:
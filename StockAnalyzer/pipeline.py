@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import threading
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from analysis import get_stock_data, calculate_indicators, get_real_time_sentiments
+from llm_report import generate_swot_report, save_swot_pdf
+from voiceover import generate_voiceover
+
+# Orchestrates one "Run Full Analysis":
+#
+#   prices ─┐
+#           ├─> swot ─┬─> pdf
+#   sentiment ┘       └─> voice
+#
+# Prices and sentiment run concurrently, and so do the PDF and the voiceover
+# once the SWOT text exists. Every stage's output is saved under
+# ARTIFACT_DIR/<date>/<ticker>_<period>/, so a rerun for the same ticker,
+# period and day reads the artifacts back instead of recomputing them.
+
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "artifacts")
+
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+def _key_lock(folder: str) -> threading.Lock:
+    with _key_locks_guard:
+        return _key_locks.setdefault(folder, threading.Lock())
+
+def _write_text(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def _read_text(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def _info_path(bars_path: str) -> str:
+    return os.path.join(os.path.dirname(bars_path), "info.json")
+
+def _read_prices(path: str):
+    hist = pd.read_parquet(path)
+    with open(_info_path(path), encoding="utf-8") as f:
+        return hist, json.load(f)
+
+def artifact_folder(ticker: str, period: str, day: str = None) -> str:
+    return os.path.join(ARTIFACT_DIR, day or date.today().isoformat(), f"{ticker}_{period}")
+
+def run_analysis(ticker: str, period="6mo", day: str = None) -> dict:
+    """
+    Full single-stock analysis with memoized artifacts.
+    Returns hist, info, sentiment, swot, pdf_file, audio_file, plus
+    timings {stage: seconds} and cached {stage: bool}.
+    """
+    folder = artifact_folder(ticker, period, day)
+    os.makedirs(folder, exist_ok=True)
+    timings, cached = {}, {}
+
+    def stage(name, filename, produce, load):
+        # produce(path) writes the artifact; it goes to a temporary name first
+        # so an interrupted run never leaves a half-written file to be reused.
+        path = os.path.join(folder, filename)
+        start = time.perf_counter()
+        cached[name] = os.path.exists(path)
+        if not cached[name]:
+            root, ext = os.path.splitext(path)
+            tmp = f"{root}.tmp{ext}"
+            produce(tmp)
+            os.replace(tmp, path)
+        value = load(path)
+        timings[name] = round(time.perf_counter() - start, 3)
+        return value
+
+    start = time.perf_counter()
+    with _key_lock(folder), ThreadPoolExecutor(max_workers=2) as pool:
+        sentiment_future = pool.submit(stage, "sentiment", "sentiment.md",
+                                       lambda path: _write_text(path, get_real_time_sentiments(ticker)), _read_text)
+
+        def fetch_prices(path):
+            # info.json is written first; the bars file appearing marks the stage done
+            hist, info = get_stock_data(ticker, period)
+            with open(_info_path(path), "w", encoding="utf-8") as f:
+                json.dump(info, f, ensure_ascii=False, default=str)
+            calculate_indicators(hist).to_parquet(path)
+        hist, info = stage("prices", "history.parquet", fetch_prices, _read_prices)
+        sentiment = sentiment_future.result()
+
+        swot = stage("swot", "swot.md", lambda path: _write_text(path, generate_swot_report(info, sentiment)), _read_text)
+
+        pdf_future = pool.submit(stage, "pdf", "swot_report.pdf", lambda path: save_swot_pdf(swot, filename=path), lambda path: path)
+        audio_future = pool.submit(stage, "voice", "report.mp3", lambda path: generate_voiceover(swot, filename=path), lambda path: path)
+        pdf_file, audio_file = pdf_future.result(), audio_future.result()
+
+    timings["total"] = round(time.perf_counter() - start, 3)
+    return {
+        "hist": hist,
+        "info": info,
+        "sentiment": sentiment,
+        "swot": swot,
+        "pdf_file": pdf_file,
+        "audio_file": audio_file,
+        "timings": timings,
+        "cached": cached
+    }
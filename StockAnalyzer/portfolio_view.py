@@ -0,0 +1,118 @@
+import time
+import numpy as np
+import pandas as pd
+import streamlit as st
+from matplotlib import pyplot as plt
+from analysis import analyze_portfolio
+
+# Portfolio mode for main.py: analyze several tickers at once and compare
+# them side by side.
+
+def latest_indicator_table(result: dict) -> pd.DataFrame:
+    """One row per ticker with the most recent reading of each indicator."""
+    close = result["close"].ffill().iloc[-1]
+    panel = {name: frame.ffill().iloc[-1] for name, frame in result["panel"].items()}
+    band_width = (panel["BB_Upper"] - panel["BB_Lower"]).replace(0, np.nan)
+    return pd.DataFrame({
+        "RSI": panel["RSI"],
+        "MACD - Signal %": 100 * (panel["MACD"] - panel["Signal"]) / close,
+        "vs MA20 %": 100 * (close / panel["MA20"] - 1),
+        "vs MA50 %": 100 * (close / panel["MA50"] - 1),
+        "Bollinger %B": (close - panel["BB_Lower"]) / band_width,
+        "ATR %": 100 * panel["ATR"] / close,
+    })
+
+def performance_table(close: pd.DataFrame) -> pd.DataFrame:
+    returns = close.pct_change(fill_method=None)
+    drawdown = close / close.cummax() - 1
+    return pd.DataFrame({
+        "Return %": 100 * (close.ffill().iloc[-1] / close.bfill().iloc[0] - 1),
+        "Volatility % (ann.)": 100 * returns.std() * np.sqrt(252),
+        "Max drawdown %": 100 * drawdown.min(),
+    }).round(2)
+
+def heatmap(ax, values: pd.DataFrame, colors: pd.DataFrame, cmap, limit: float, fmt="{:.2f}"):
+    ax.imshow(colors.to_numpy(dtype=float), cmap=cmap, aspect="auto", vmin=-limit, vmax=limit)
+    ax.set_xticks(range(len(values.columns)), values.columns, rotation=45, ha="right")
+    ax.set_yticks(range(len(values.index)), values.index)
+    for i in range(values.shape[0]):
+        for j in range(values.shape[1]):
+            value = values.iat[i, j]
+            ax.text(j, i, "" if pd.isna(value) else fmt.format(value), ha="center", va="center", fontsize=8)
+
+def render_portfolio(stock_options: dict):
+    names = st.multiselect("📌 Select Companies", options=list(stock_options.keys()), default=list(stock_options.keys()))
+    period = st.radio("📅 Select Time Period", ["1mo", "3mo", "6mo", "1y", "2y"], index=2, horizontal=True, key="portfolio_period")
+    with_sentiment = st.checkbox("📰 Include news sentiment (one LLM call per company)", value=True)
+
+    if not st.button("🚀 Run Portfolio Analysis"):
+        st.markdown("👈 Choose companies and run the analysis to compare them.")
+        return
+    if len(names) < 2:
+        st.warning("Select at least two companies to compare.")
+        return
+
+    tickers = [stock_options[name] for name in names]
+    labels = {stock_options[name]: name for name in names}
+    start = time.perf_counter()
+    try:
+        with st.spinner(f"⏳ Fetching {len(tickers)} tickers and running analysis..."):
+            result = analyze_portfolio(tickers, period, with_sentiment=with_sentiment)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    elapsed = time.perf_counter() - start
+
+    missing = [labels[ticker] for ticker in tickers if ticker not in result["history"]]
+    if missing:
+        st.warning(f"⚠️ No price data for {', '.join(missing)}; showing the remaining companies.")
+
+    close = result["close"].rename(columns=labels)
+    reports = pd.DataFrame(result["fetch_reports"]).T
+    bulk = sum(1 for report in result["fetch_reports"].values() if report.get("bulk_download"))
+    st.caption(
+        f"⏱️ {elapsed:.1f}s · {int(reports['history_fetches'].sum())} single-ticker history fetches · "
+        f"{bulk} tickers via bulk download · {int(reports['info_fetches'].sum())} info fetches"
+    )
+
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📈 Relative Performance", "🔗 Correlation", "🌡️ Indicator Heatmap", "📰 Sentiment", "🗄️ Data Fetches"])
+
+    with tab1:
+        st.subheader("📈 Rebased Performance (start = 100)")
+        fig, ax = plt.subplots(figsize=(12, 6))
+        rebased = 100 * close / close.bfill().iloc[0]
+        for column in rebased.columns:
+            ax.plot(rebased.index, rebased[column], label=column)
+        ax.axhline(100, color="black", linestyle="--", linewidth=0.8)
+        ax.legend(fontsize=8, ncol=2)
+        st.pyplot(fig)
+        st.dataframe(performance_table(close))
+
+    with tab2:
+        st.subheader("🔗 Correlation of Daily Returns")
+        corr = close.pct_change(fill_method=None).corr()
+        fig, ax = plt.subplots(figsize=(9, 7))
+        heatmap(ax, corr, corr, "coolwarm", limit=1)
+        st.pyplot(fig)
+
+    with tab3:
+        st.subheader("🌡️ Latest Indicators")
+        table = latest_indicator_table(result).rename(index=labels)
+        # Colour each column by its z-score across the portfolio
+        zscores = (table - table.mean()) / table.std().replace(0, np.nan)
+        fig, ax = plt.subplots(figsize=(10, 0.5 * len(table) + 2))
+        heatmap(ax, table, zscores.fillna(0), "RdYlGn", limit=2)
+        st.pyplot(fig)
+        st.caption("Colours show how each company compares with the rest of the selection (z-score per column).")
+
+    with tab4:
+        st.subheader("📰 Real-Time News Sentiment")
+        if not result["sentiment"]:
+            st.markdown("Sentiment was not requested for this run.")
+        for ticker, sentiment in result["sentiment"].items():
+            with st.expander(labels.get(ticker, ticker)):
+                st.markdown(sentiment)
+
+    with tab5:
+        st.subheader("🗄️ Price Store Fetches")
+        st.dataframe(reports.rename(index=labels))
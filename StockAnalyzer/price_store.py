@@ -0,0 +1,343 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Local Parquet store of daily bars and company info, one directory per
+# ticker:
+#
+#   price_store/ticker=RELIANCE.NS/bars.parquet   daily OHLCV, date index
+#   price_store/ticker=RELIANCE.NS/meta.json      date range stored, last day asked for
+#   price_store/ticker=RELIANCE.NS/info.json      yfinance .info, with fetch time
+#
+# load() fetches only the parts of the requested period outside the stored
+# range, merges them in, and reads bars back memory-mapped. The most recent
+# day is re-fetched after REFRESH_SECONDS so intraday bars stay current. A
+# fetch that returns no bars (weekend, holiday, before the open) is not an
+# error; the stored range only grows to the bars actually received.
+#
+# Sources fail quietly: yfinance often returns an empty frame instead of
+# raising, and the Alpha Vantage fallback only has the last ~100 days. So a
+# fetch counts only if its bars reach within MAX_GAP of the start of the
+# range (and, for a backfill, of the stored range it joins); anything else
+# is a failed fetch and the range stays missing, so no hole is recorded as
+# covered.
+#
+# load_many() serves a whole portfolio: one bulk yf.download() for every
+# ticker's missing range, then per-ticker work on a bounded thread pool. A
+# ticker that fails is reported and returned empty; the others still load.
+#
+# With PRICE_STORE_OFFLINE=1 nothing is fetched; tickers missing from the
+# store are seeded from CSV fixtures (FIXTURE_DIR/<TICKER>.csv, info.json).
+
+STORE_DIR = os.getenv("PRICE_STORE_DIR", "price_store")
+FIXTURE_DIR = os.getenv("PRICE_FIXTURE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "prices"))
+OFFLINE = os.getenv("PRICE_STORE_OFFLINE", "0") == "1"
+REFRESH_SECONDS = float(os.getenv("PRICE_STORE_REFRESH", 900))
+INFO_TTL = float(os.getenv("PRICE_STORE_INFO_TTL", 24 * 3600))
+FETCH_WORKERS = int(os.getenv("PRICE_FETCH_WORKERS", 4))
+# Longest run of days without a bar that is still just a market closure
+MAX_GAP = pd.Timedelta(days=int(os.getenv("PRICE_STORE_MAX_GAP_DAYS", 7)))
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+ALPHA_VANTAGE_COLUMNS = {"1. open": "Open", "2. high": "High", "3. low": "Low", "4. close": "Close", "5. adjusted close": "Close", "6. volume": "Volume"}
+
+def period_start(period: str, today: pd.Timestamp) -> pd.Timestamp:
+    """First date covered by a yfinance-style period ("5d", "6mo", "2y", "ytd")."""
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1)
+    for suffix, unit in (("mo", "months"), ("y", "years"), ("d", "days")):
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            return today - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
+
+def normalize_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """Daily bars with a tz-naive date index and float OHLCV columns, whatever the source."""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS, index=pd.DatetimeIndex([], name="Date"), dtype=float)
+    df = df.rename(columns=ALPHA_VANTAGE_COLUMNS)
+    df = df.loc[:, ~df.columns.duplicated(keep="last")]
+    index = pd.to_datetime(df.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df = df.set_axis(index.normalize().rename("Date"))
+    columns = [column for column in BAR_COLUMNS if column in df.columns]
+    return df[columns].astype(float)
+
+def spans(bars: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp, to_end=False) -> bool:
+    """
+    Whether `bars` fetched for [start, end] really cover it: the first bar is
+    within MAX_GAP of `start` (and, with `to_end`, the last bar within MAX_GAP
+    of `end`). An empty result only counts for a range shorter than MAX_GAP.
+    """
+    if bars is None:
+        return False
+    if bars.empty:
+        return end - start < MAX_GAP
+    if bars.index.min() - start >= MAX_GAP:
+        return False
+    return not to_end or end - bars.index.max() < MAX_GAP
+
+
+class PriceStore:
+    def __init__(self, root=STORE_DIR, offline=OFFLINE, fixture_dir=FIXTURE_DIR):
+        self.root = root
+        self.offline = offline
+        self.fixture_dir = fixture_dir
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _dir(self, ticker: str) -> str:
+        return os.path.join(self.root, f"ticker={ticker}")
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def _read_json(self, ticker: str, name: str):
+        path = os.path.join(self._dir(ticker), name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_json(self, ticker: str, name: str, data):
+        path = os.path.join(self._dir(ticker), name)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(path + ".tmp", path)
+
+    def read_bars(self, ticker: str) -> pd.DataFrame:
+        path = os.path.join(self._dir(ticker), "bars.parquet")
+        if not os.path.exists(path):
+            return normalize_bars(None)
+        return pq.read_table(path, memory_map=True).to_pandas()
+
+    def _write_bars(self, ticker: str, bars: pd.DataFrame):
+        path = os.path.join(self._dir(ticker), "bars.parquet")
+        pq.write_table(pa.Table.from_pandas(bars), path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    def _merge(self, ticker: str, fetched: list[pd.DataFrame]) -> pd.DataFrame:
+        bars = pd.concat([self.read_bars(ticker), *fetched])
+        bars = bars[~bars.index.duplicated(keep="last")].sort_index()
+        self._write_bars(ticker, bars)
+        return bars
+
+    # -- sources ---------------------------------------------------------
+
+    def _fetch_bars(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp, to_end=False):
+        """
+        Bars for [start, end] from yfinance, or from Alpha Vantage if yfinance
+        fails or its bars do not span() the range. An empty frame means there
+        were no bars in a short range; None means neither source covered it.
+        """
+        import yfinance as yf
+        try:
+            bars = normalize_bars(yf.Ticker(ticker).history(start=start, end=end + pd.Timedelta(days=1))).loc[start:end]
+            if spans(bars, start, end, to_end):
+                return bars
+        except Exception:
+            pass
+        try:
+            from analysis import get_from_alpha_vantage
+            bars = normalize_bars(get_from_alpha_vantage(ticker)[0]).loc[start:end]
+            return bars if spans(bars, start, end, to_end) else None
+        except Exception:
+            return None
+
+    def _fetch_info(self, ticker: str) -> dict:
+        import yfinance as yf
+        try:
+            return yf.Ticker(ticker).info
+        except Exception:
+            return {"shortName": ticker, "sector": "N/A", "marketCap": "N/A", "longBusinessSummary": "N/A"}
+
+    def _seed_from_fixture(self, ticker: str):
+        path = os.path.join(self.fixture_dir, f"{ticker}.csv")
+        if not os.path.exists(path):
+            return None
+        bars = normalize_bars(pd.read_csv(path, index_col="Date", parse_dates=True))
+        self._write_bars(ticker, bars)
+        infos = {}
+        if os.path.exists(os.path.join(self.fixture_dir, "info.json")):
+            with open(os.path.join(self.fixture_dir, "info.json"), encoding="utf-8") as f:
+                infos = json.load(f)
+        self._write_json(ticker, "info.json", {"fetched_at": time.time(), "info": infos.get(ticker, {"shortName": ticker})})
+        end = str(bars.index.max().date())
+        meta = {"start": str(bars.index.min().date()), "end": end, "checked": end, "fetched_at": time.time()}
+        self._write_json(ticker, "meta.json", meta)
+        return meta
+
+    # -- public API ------------------------------------------------------
+
+    def missing_ranges(self, meta: dict, start: pd.Timestamp, today: pd.Timestamp) -> list:
+        if meta is None:
+            return [(start, today)]
+        covered_start, covered_end = pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+        ranges = []
+        if start < covered_start:
+            ranges.append((start, covered_start - pd.Timedelta(days=1)))
+        checked = pd.Timestamp(meta.get("checked", meta["end"]))
+        if checked < today or time.time() - meta["fetched_at"] > REFRESH_SECONDS:
+            # Re-fetch the last stored day too, in case its bar was still forming
+            ranges.append((covered_end, today))
+        return ranges
+
+    def _covered(self, meta: dict, range_start: pd.Timestamp, range_end: pd.Timestamp, bars: pd.DataFrame):
+        """meta after a fetch of [range_start, range_end] whose `bars` span() it."""
+        if meta is None:
+            if bars.empty:
+                return None
+            return {"start": str(range_start.date()), "end": str(bars.index.max().date()), "checked": str(range_end.date())}
+        end = pd.Timestamp(meta["end"]) if bars.empty else max(pd.Timestamp(meta["end"]), bars.index.max())
+        checked = max(pd.Timestamp(meta.get("checked", meta["end"])), range_end)
+        return {
+            "start": str(min(pd.Timestamp(meta["start"]), range_start).date()),
+            "end": str(end.date()),
+            "checked": str(checked.date())
+        }
+
+    def _download(self, tickers: list[str], start: pd.Timestamp, end: pd.Timestamp, threads: int) -> dict:
+        """
+        One yf.download() call for several tickers; {ticker: bars} for those
+        that came back, or None if the call itself failed.
+        """
+        import yfinance as yf
+        try:
+            data = yf.download(tickers, start=start, end=end + pd.Timedelta(days=1), group_by="ticker",
+                               auto_adjust=True, threads=threads, progress=False)
+        except Exception:
+            return None
+        if data is None or data.empty:
+            return {}
+        if not isinstance(data.columns, pd.MultiIndex):
+            return {tickers[0]: normalize_bars(data.dropna(how="all"))}
+        downloaded = {}
+        for ticker in tickers:
+            if ticker in data.columns.get_level_values(0):
+                bars = normalize_bars(data[ticker].dropna(how="all"))
+                if not bars.empty:
+                    downloaded[ticker] = bars
+        return downloaded
+
+    def _plan(self, ticker: str, period: str):
+        """(start, end, missing ranges) for `ticker`; offline plans never fetch."""
+        today = pd.Timestamp.today().normalize()
+        os.makedirs(self._dir(ticker), exist_ok=True)
+        meta = self._read_json(ticker, "meta.json")
+        if meta is None and self.offline:
+            meta = self._seed_from_fixture(ticker)
+        if self.offline:
+            # Offline data is frozen; measure the period back from its last day
+            today = pd.Timestamp(meta["end"]) if meta else today
+            return period_start(period, today), today, []
+        start = period_start(period, today)
+        return start, today, self.missing_ranges(meta, start, today)
+
+    def _complete(self, ticker: str, start, today, ranges, prefetched: pd.DataFrame = None):
+        """Fill `ranges` (from `prefetched` bars where they span the range), refresh info, read the period."""
+        report = {"ticker": ticker, "history_fetches": 0, "info_fetches": 0, "bars_fetched": 0, "failed_fetches": 0, "offline": self.offline}
+
+        with self._lock(ticker):
+            meta = self._read_json(ticker, "meta.json")
+            if ranges:
+                fetched = []
+                for range_start, range_end in ranges:
+                    # A backfill must also join up with the stored range
+                    backfill = meta is not None and range_end < pd.Timestamp(meta["start"])
+                    bars = prefetched.loc[range_start:range_end] if prefetched is not None else None
+                    if not spans(bars, range_start, range_end, backfill):
+                        bars = self._fetch_bars(ticker, range_start, range_end, backfill)
+                        report["history_fetches"] += 1
+                    if bars is None:
+                        # Leave the range uncovered so the next load asks again
+                        report["failed_fetches"] += 1
+                        continue
+                    fetched.append(bars)
+                    report["bars_fetched"] += len(bars)
+                    meta = self._covered(meta, range_start, range_end, bars)
+                if fetched:
+                    self._merge(ticker, fetched)
+                if meta:
+                    self._write_json(ticker, "meta.json", {**meta, "fetched_at": time.time()})
+
+            cached_info = self._read_json(ticker, "info.json")
+            if cached_info and (self.offline or time.time() - cached_info["fetched_at"] < INFO_TTL):
+                info = cached_info["info"]
+            elif self.offline:
+                info = {"shortName": ticker, "sector": "N/A", "marketCap": "N/A", "longBusinessSummary": "N/A"}
+            else:
+                info = self._fetch_info(ticker)
+                report["info_fetches"] += 1
+                self._write_json(ticker, "info.json", {"fetched_at": time.time(), "info": info})
+
+            bars = self.read_bars(ticker).loc[start:today]
+
+        report["bars"] = len(bars)
+        return bars, info, report
+
+    def _complete_or_fail(self, ticker: str, *args):
+        """_complete() that reports an exception instead of raising it."""
+        try:
+            return self._complete(ticker, *args)
+        except Exception as e:
+            report = {"ticker": ticker, "history_fetches": 0, "info_fetches": 0, "bars_fetched": 0,
+                      "failed_fetches": 1, "offline": self.offline, "bars": 0, "error": str(e)}
+            return normalize_bars(None), {"shortName": ticker}, report
+
+    def load(self, ticker: str, period="6mo"):
+        """
+        Bars for `period` and company info, fetching only what the store lacks.
+        Returns (bars, info, report) where report counts network fetches.
+        """
+        with self._lock(ticker):
+            start, today, ranges = self._plan(ticker, period)
+        return self._complete(ticker, start, today, ranges)
+
+    def load_many(self, tickers: list[str], period="6mo", max_workers=FETCH_WORKERS) -> dict:
+        """
+        load() for several tickers: missing history for all of them comes from
+        one bulk yf.download(), then per-ticker work (merging, info fetches,
+        fallbacks for tickers the bulk call missed) runs on a bounded pool.
+        Returns {ticker: (bars, info, report)}.
+        """
+        plans = {}
+        for ticker in tickers:
+            with self._lock(ticker):
+                plans[ticker] = self._plan(ticker, period)
+
+        needing = [ticker for ticker, (_, _, ranges) in plans.items() if ranges]
+        downloaded = None
+        if needing:
+            first = min(range_start for ticker in needing for range_start, _ in plans[ticker][2])
+            last = max(range_end for ticker in needing for _, range_end in plans[ticker][2])
+            downloaded = self._download(needing, first, last, threads=max_workers)
+
+        def prefetched(ticker):
+            # yf.download() swallows per-ticker errors, so a ticker with no rows
+            # in the bulk result is fetched on its own rather than trusted
+            return downloaded.get(ticker) if downloaded else None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {ticker: pool.submit(self._complete_or_fail, ticker, *plans[ticker], prefetched(ticker)) for ticker in tickers}
+            results = {ticker: future.result() for ticker, future in futures.items()}
+
+        for ticker in needing:
+            results[ticker][2]["bulk_download"] = downloaded is not None and ticker in downloaded
+        return results
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_price_store() -> PriceStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = PriceStore()
+        return _store
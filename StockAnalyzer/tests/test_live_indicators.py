@@ -0,0 +1,40 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from analysis import calculate_indicators
+from live_indicators import IndicatorState
+from price_store import FIXTURE_DIR
+
+COLUMNS = ["MA20", "MA50", "RSI", "MACD", "Signal"]
+
+
+def random_walk(bars=2000, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, bars))), index=pd.bdate_range("2015-01-01", periods=bars))
+
+
+def fixture_closes():
+    return pd.read_csv(os.path.join(FIXTURE_DIR, "RELIANCE.NS.csv"), index_col="Date", parse_dates=True)["Close"]
+
+
+def assert_streaming_matches_batch(prices, seed_bars):
+    full = calculate_indicators(pd.DataFrame({"Close": prices}))
+    state = IndicatorState.from_frame(calculate_indicators(pd.DataFrame({"Close": prices.iloc[:seed_bars]})))
+    streamed = pd.DataFrame([state.update(price) for price in prices.iloc[seed_bars:]], index=prices.index[seed_bars:])
+
+    for column in COLUMNS:
+        expected, actual = full[column].iloc[seed_bars:], streamed[column]
+        assert (expected.isna() == actual.isna()).all(), column
+        np.testing.assert_allclose(actual.dropna(), expected.dropna(), rtol=0, atol=1e-9, err_msg=column)
+
+
+# Seeds before, inside and after the 14/20/26/50-bar warm-ups
+@pytest.mark.parametrize("seed_bars", [1, 10, 30, 60, 500])
+def test_streaming_matches_batch_on_random_walk(seed_bars):
+    assert_streaming_matches_batch(random_walk(), seed_bars)
+
+
+@pytest.mark.parametrize("seed_bars", [1, 60])
+def test_streaming_matches_batch_on_fixture_prices(seed_bars):
+    assert_streaming_matches_batch(fixture_closes(), seed_bars)
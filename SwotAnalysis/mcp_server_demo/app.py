@@ -1,4 +1,5 @@
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 from dotenv import load_dotenv, find_dotenv
@@ -6,7 +7,7 @@ import os
 import pandas as pd
 import matplotlib.pyplot as plt
 import json
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, send_from_directory, url_for
 import unicodedata
 import base64
 from datetime import datetime
@@ -31,6 +32,18 @@ os.makedirs(RESULTS_DIR, exist_ok=True)
 PDF_DIR = os.path.join(os.getcwd(), "pdf_reports")
 os.makedirs(PDF_DIR, exist_ok=True)
 
+CHART_DIR = os.path.join(os.getcwd(), "charts")
+os.makedirs(CHART_DIR, exist_ok=True)
+
+#number of reviews sent to the sentiment model per streamed batch
+SENTIMENT_BATCH_SIZE = int(os.environ.get("SENTIMENT_BATCH_SIZE", 8))
+#reviews per forward pass of the sentiment model
+SENTIMENT_INFERENCE_BATCH = int(os.environ.get("SENTIMENT_INFERENCE_BATCH", 32))
+
+#bulk comparison limits
+MAX_BULK_PRODUCTS = int(os.environ.get("MAX_BULK_PRODUCTS", 50))
+SEARCH_WORKERS = int(os.environ.get("SEARCH_WORKERS", 8))
+
 def load_sentiment_model():
     global SENTIMENT_MODEL
     if SENTIMENT_MODEL is None:
@@ -52,20 +65,7 @@ def analyze():
     try:
         analysis_results = ecomerce_swot_analyzer(product_name)
         print(analysis_results)
-        #save analysis results to a local directory
-        time_stamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        safe_name = product_name.replace(" ", "_").replace("/", "_")
-        file_name = f"{safe_name}_{time_stamp}.json"
-        file_path = os.path.join(RESULTS_DIR, file_name)
-
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(analysis_results, f,ascii=False, indent=4)
-
-        #save the analysis in pdf file
-        pdf_file_name = f"{safe_name}_{time_stamp}.pdf"
-        pdf_file_path = os.path.join(PDF_DIR, pdf_file_name)
-        generate_pdf_report(analysis_results, pdf_file_path)
-        print(generate_pdf_report)
+        file_path, pdf_file_path = save_analysis(product_name, analysis_results)
 
         analysis_results["local_file"] = file_path
         analysis_results["pdf_file"] = pdf_file_path
@@ -74,7 +74,138 @@ def analyze():
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    
+
+
+@app.route("/analyze/stream", methods=["POST"])
+def analyze_stream():
+    data = request.json
+
+    if not data or "product_name" not in data:
+        return jsonify({"error": "Invalid request data"}), 400
+
+    product_name = data["product_name"]
+
+    def generate():
+        try:
+            for event in stream_swot_analysis(product_name):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            yield json.dumps({"event": "error", "error": str(e)}) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@app.route("/analyze/bulk", methods=["POST"])
+def analyze_bulk():
+    data = request.json
+
+    if not data or not isinstance(data.get("product_names"), list):
+        return jsonify({"error": "Invalid request data"}), 400
+
+    product_names = [p for p in data["product_names"] if isinstance(p, str) and p.strip()]
+    if not product_names:
+        return jsonify({"error": "product_names must contain at least one non-empty name"}), 400
+    if len(product_names) > MAX_BULK_PRODUCTS:
+        return jsonify({"error": f"At most {MAX_BULK_PRODUCTS} products per request"}), 400
+
+    try:
+        results = bulk_swot_analyzer(product_names)
+
+        time_stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        file_path = os.path.join(RESULTS_DIR, f"bulk_{time_stamp}.json")
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+        results["local_file"] = file_path
+        return jsonify(results), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/charts/<path:file_name>")
+def get_chart(file_name):
+    return send_from_directory(CHART_DIR, file_name)
+
+
+@app.route("/reports/<path:file_name>")
+def get_report(file_name):
+    return send_from_directory(PDF_DIR, file_name)
+
+
+def save_analysis(product_name, analysis_results):
+    #save analysis results to a local directory
+    time_stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    safe_name = product_name.replace(" ", "_").replace("/", "_")
+    file_name = f"{safe_name}_{time_stamp}.json"
+    file_path = os.path.join(RESULTS_DIR, file_name)
+
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(analysis_results, f, ensure_ascii=False, indent=4)
+
+    #save the analysis in pdf file
+    pdf_file_name = f"{safe_name}_{time_stamp}.pdf"
+    pdf_file_path = os.path.join(PDF_DIR, pdf_file_name)
+    generate_pdf_report(analysis_results, pdf_file_path)
+
+    return file_path, pdf_file_path
+
+
+def stream_swot_analysis(product_name: str):
+    """
+    Run the SWOT pipeline stage by stage, yielding one event dict per stage so
+    clients see search results and sentiment before the report is ready.
+    The chart and PDF are written to disk and referenced by URL.
+    """
+    product_data = scrape_data(product_name)
+    yield {"event": "search", "product": product_name, "results": product_data}
+
+    reviews = [p["reviews"] for p in product_data if p.get("reviews")]
+    if not reviews:
+        analysis_results = fallback_analysis(product_name)
+        yield {"event": "swot", "analysis": analysis_results["analysis"], "source": "fallback"}
+    else:
+        frames = []
+        for batch_no, batch_df in enumerate(iter_sentiment_batches(reviews)):
+            frames.append(batch_df)
+            yield {
+                "event": "sentiment",
+                "batch": batch_no,
+                "results": batch_df[["review", "label", "score"]].to_dict(orient="records")
+            }
+
+        sentiment_df = pd.concat(frames, ignore_index=True)
+        swot_data = map_to_swot(sentiment_df)
+        yield {"event": "swot", "analysis": swot_data, "source": "api"}
+
+        summary = summarize_sentiment(sentiment_df)
+        yield {"event": "summary", "summary": summary}
+
+        analysis_results = {
+            "product": product_name,
+            "analysis": swot_data,
+            "chart": None,
+            "summary": summary,
+            "source": "api"
+        }
+
+        safe_name = product_name.replace(" ", "_").replace("/", "_")
+        chart_name = f"{safe_name}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
+        with open(os.path.join(CHART_DIR, chart_name), "wb") as f:
+            f.write(render_chart(sentiment_df, product_name))
+        analysis_results["chart_file"] = os.path.join(CHART_DIR, chart_name)
+
+    file_path, pdf_file_path = save_analysis(product_name, analysis_results)
+    chart_file = analysis_results.get("chart_file")
+
+    yield {
+        "event": "artifacts",
+        "chart_url": url_for("get_chart", file_name=os.path.basename(chart_file), _external=True) if chart_file else None,
+        "pdf_url": url_for("get_report", file_name=os.path.basename(pdf_file_path), _external=True),
+        "local_file": file_path
+    }
+    yield {"event": "done"}
+
 
 def generate_pdf_report(data, pdf_path):
     pdf = FPDF()
@@ -103,7 +234,9 @@ def generate_pdf_report(data, pdf_path):
             pdf.multi_cell(0, 10, f"- {safe_item}")
 
     # Insert chart if available
-    if data.get("chart"):
+    if data.get("chart_file"):
+        pdf.image(data["chart_file"], x=30, w=150)
+    elif data.get("chart"):
         image_data = base64.b64decode(data["chart"])
         chart_path = os.path.join(tempfile.gettempdir(), "chart.png")
         with open(chart_path, "wb") as f:
@@ -112,126 +245,194 @@ def generate_pdf_report(data, pdf_path):
 
     pdf.output(pdf_path)
 
-def ecomerce_swot_analyzer(product_name: str):
-    def scrape_data(product_name):
-        query = f"{product_name} site:amazon.in OR site:flipkart.com"
-        url = "https://www.googleapis.com/customsearch/v1"
-        params = {
-            "q": query,
-            "key":GOOGLE_API_KEY,
-            "cx": GOOGLE_CX,
-        }
-        res = requests.get(url, params=params)
-        #print(res.text)
-        if res.status_code != 200:
-            raise Exception("Google Search API failed: " + res.text)
-        data = res.json()
-        #print(data)
-        items = data.get("items", [])
-        results = []
-        for item in items:
-            results.append({
-                "title": item.get("title"),
-                "link": item.get("link"),
-                "price": "₹1,999",
-                "source": "Amazon" if "amazon" in item.get("link", "") else "Flipkart",
-                "rating": "4.2",
-                "reviews": item.get("snippet")
-            })
-        return results
-
-    def analyze_sentiment(reviews):
-        model = load_sentiment_model()
-        sentiments = model(reviews)
-        df = pd.DataFrame(sentiments)
-        df["review"] = reviews
-        return df
-
-    def map_to_swot(df):
-        swot = {"Strengths": [], "Weaknesses": [], "Opportunities": [], "Threats": []}
-        for _, row in df.iterrows():
-            text = row["review"]
-            label = row["label"]
-            if label == "POSITIVE":
-                if "price" in text.lower():
-                    swot["Strengths"].append(text)
-                else:
-                    swot["Opportunities"].append(text)
+def scrape_data(product_name):
+    query = f"{product_name} site:amazon.in OR site:flipkart.com"
+    url = "https://www.googleapis.com/customsearch/v1"
+    params = {
+        "q": query,
+        "key":GOOGLE_API_KEY,
+        "cx": GOOGLE_CX,
+    }
+    res = requests.get(url, params=params)
+    #print(res.text)
+    if res.status_code != 200:
+        raise Exception("Google Search API failed: " + res.text)
+    data = res.json()
+    #print(data)
+    items = data.get("items", [])
+    results = []
+    for item in items:
+        results.append({
+            "title": item.get("title"),
+            "link": item.get("link"),
+            "price": "₹1,999",
+            "source": "Amazon" if "amazon" in item.get("link", "") else "Flipkart",
+            "rating": "4.2",
+            "reviews": item.get("snippet")
+        })
+    return results
+
+def analyze_sentiment(reviews):
+    model = load_sentiment_model()
+    #batched forward passes; reviews longer than the model's 512 tokens are truncated, not fatal
+    sentiments = model(reviews, batch_size=SENTIMENT_INFERENCE_BATCH, truncation=True)
+    df = pd.DataFrame(sentiments)
+    df["review"] = reviews
+    return df
+
+def iter_sentiment_batches(reviews, batch_size=None):
+    batch_size = batch_size or SENTIMENT_BATCH_SIZE
+    for start in range(0, len(reviews), batch_size):
+        yield analyze_sentiment(reviews[start:start + batch_size])
+
+def map_to_swot(df):
+    swot = {"Strengths": [], "Weaknesses": [], "Opportunities": [], "Threats": []}
+    for _, row in df.iterrows():
+        text = row["review"]
+        label = row["label"]
+        if label == "POSITIVE":
+            if "price" in text.lower():
+                swot["Strengths"].append(text)
             else:
-                if "delivery" in text.lower():
-                    swot["Threats"].append(text)
-                else:
-                    swot["Weaknesses"].append(text)
-        return swot
-
-    def visualize(df, product_name):
-        counts = df["label"].value_counts()
-        fig, ax = plt.subplots()
-        counts.plot(kind="bar", ax=ax, title=f"Sentiment Analysis for '{product_name}'")
-
-        from io import BytesIO
-        buf = BytesIO()
-        plt.savefig(buf, format='png')
-        plt.close()
-        buf.seek(0)
-
-        img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-        return img_base64
+                swot["Opportunities"].append(text)
+        else:
+            if "delivery" in text.lower():
+                swot["Threats"].append(text)
+            else:
+                swot["Weaknesses"].append(text)
+    return swot
+
+def render_chart(df, product_name):
+    counts = df["label"].value_counts()
+    fig, ax = plt.subplots()
+    counts.plot(kind="bar", ax=ax, title=f"Sentiment Analysis for '{product_name}'")
+
+    from io import BytesIO
+    buf = BytesIO()
+    plt.savefig(buf, format='png')
+    plt.close()
+    buf.seek(0)
+    return buf.read()
+
+def summarize_sentiment(df):
+    positive_count = len(df[df["label"] == "POSITIVE"])
+    negative_count = len(df[df["label"] == "NEGATIVE"])
+    return {
+        "total_reviews": len(df),
+        "positive": positive_count,
+        "negative": negative_count,
+        "positive_percentage": round((positive_count / len(df)) * 100, 1)
+    }
+
+def fallback_analysis(product_name):
+    return {
+        "product": product_name,
+        "analysis": {
+            "Strengths": [
+                f"Brand recognition for {product_name}",
+                "Quality build and materials",
+                "Strong ecosystem integration"
+            ],
+            "Weaknesses": [
+                "Premium pricing limiting market penetration",
+                "Limited customization compared to competitors",
+                "Proprietary accessories and components"
+            ],
+            "Opportunities": [
+                "Emerging markets expansion",
+                "Services revenue growth",
+                "Sustainability initiatives appeal"
+            ],
+            "Threats": [
+                "Increasing market competition",
+                "Economic uncertainties affecting consumer spending",
+                "Regulatory challenges in key markets"
+            ]
+        },
+        "chart": None,
+        "source": "fallback"
+    }
 
+def ecomerce_swot_analyzer(product_name: str):
     product_data = scrape_data(product_name)
     reviews = [p["reviews"] for p in product_data if p.get("reviews")]
 
     if not reviews:
-        return {
-            "product": product_name,
-            "analysis": {
-                "Strengths": [
-                    f"Brand recognition for {product_name}",
-                    "Quality build and materials",
-                    "Strong ecosystem integration"
-                ],
-                "Weaknesses": [
-                    "Premium pricing limiting market penetration",
-                    "Limited customization compared to competitors",
-                    "Proprietary accessories and components"
-                ],
-                "Opportunities": [
-                    "Emerging markets expansion",
-                    "Services revenue growth",
-                    "Sustainability initiatives appeal"
-                ],
-                "Threats": [
-                    "Increasing market competition",
-                    "Economic uncertainties affecting consumer spending",
-                    "Regulatory challenges in key markets"
-                ]
-            },
-            "chart": None,
-            "source": "fallback"
-        }
+        return fallback_analysis(product_name)
 
     sentiment_df = analyze_sentiment(reviews)
     swot_data = map_to_swot(sentiment_df)
-    chart_base64 = visualize(sentiment_df, product_name)
-
-    positive_count = len(sentiment_df[sentiment_df["label"] == "POSITIVE"])
-    negative_count = len(sentiment_df[sentiment_df["label"] == "NEGATIVE"])
+    chart_base64 = base64.b64encode(render_chart(sentiment_df, product_name)).decode('utf-8')
 
     response = {
         "product": product_name,
         "analysis": swot_data,
         "chart": chart_base64,
-        "summary": {
-            "total_reviews": len(reviews),
-            "positive": positive_count,
-            "negative": negative_count,
-            "positive_percentage": round((positive_count / len(reviews)) * 100, 1)
-        },
+        "summary": summarize_sentiment(sentiment_df),
         "source": "api"
     }
 
     return response
 
+def bulk_swot_analyzer(product_names):
+    """
+    Analyze many products at once: searches run concurrently, then every
+    product's reviews go through the sentiment model in a single batched call.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, min(SEARCH_WORKERS, len(product_names)))) as executor:
+        futures = {name: executor.submit(scrape_data, name) for name in product_names}
+
+    product_reviews = {}
+    errors = {}
+    for name, future in futures.items():
+        try:
+            product_reviews[name] = [p["reviews"] for p in future.result() if p.get("reviews")]
+        except Exception as e:
+            errors[name] = str(e)
+
+    #one inference pass over all reviews, then slice back per product
+    all_reviews = [review for reviews in product_reviews.values() for review in reviews]
+    sentiment_df = analyze_sentiment(all_reviews) if all_reviews else None
+
+    products = {}
+    offset = 0
+    for name, reviews in product_reviews.items():
+        if not reviews:
+            products[name] = fallback_analysis(name)
+            continue
+
+        product_df = sentiment_df.iloc[offset:offset + len(reviews)].reset_index(drop=True)
+        offset += len(reviews)
+        products[name] = {
+            "product": name,
+            "analysis": map_to_swot(product_df),
+            "summary": summarize_sentiment(product_df),
+            "source": "api"
+        }
+
+    comparison = []
+    for name, result in products.items():
+        summary = result.get("summary", {})
+        row = {
+            "product": name,
+            "total_reviews": summary.get("total_reviews", 0),
+            "positive": summary.get("positive", 0),
+            "negative": summary.get("negative", 0),
+            "positive_percentage": summary.get("positive_percentage"),
+            "source": result["source"]
+        }
+        for category in ["Strengths", "Weaknesses", "Opportunities", "Threats"]:
+            row[category.lower()] = len(result["analysis"].get(category, []))
+        comparison.append(row)
+
+    comparison.sort(key=lambda row: row["positive_percentage"] if row["positive_percentage"] is not None else -1, reverse=True)
+
+    return {
+        "comparison": comparison,
+        "products": products,
+        "errors": errors
+    }
+
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 5000))
     app.run(host='0.0.0.0', port=port, debug=True, use_reloader=True)
\ No newline at end of file
@@ -55,5 +55,45 @@ def test_api_endpoint():
         import traceback
         traceback.print_exc()
 
+def test_stream_endpoint():
+    """
+    Test the streaming SWOT analysis API endpoint
+    """
+    api_url = "http://127.0.0.1:5000/analyze/stream"
+    product_name = "noise headphone"
+
+    print(f"Testing streaming API for: {product_name}")
+
+    try:
+        with requests.post(api_url, json={"product_name": product_name}, stream=True) as response:
+            response.raise_for_status()
+
+            # Each line is one JSON event
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                event = json.loads(line)
+                name = event.get("event")
+
+                if name == "search":
+                    print(f"Search returned {len(event['results'])} results")
+                elif name == "sentiment":
+                    print(f"Sentiment batch {event['batch']}: {len(event['results'])} reviews")
+                elif name == "swot":
+                    for category, items in event["analysis"].items():
+                        print(f"{category}: {len(items)} items")
+                elif name == "summary":
+                    print(f"Summary: {event['summary']}")
+                elif name == "artifacts":
+                    print(f"Chart: {event['chart_url']}")
+                    print(f"PDF: {event['pdf_url']}")
+                elif name == "error":
+                    print(f"Error: {event['error']}")
+
+    except Exception as e:
+        print(f"Error calling streaming API: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
 if __name__ == "__main__":
     test_api_endpoint()
\ No newline at end of file